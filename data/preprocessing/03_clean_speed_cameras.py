@@ -6,6 +6,8 @@ import json
 import ast
 import re
 
+from spatial_index import project_utm
+
 RAW = Path("data_raw/speed_cameras.csv")
 OUT_DIR = Path("data_clean")
 OUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -86,6 +88,9 @@ def main():
     # Loose GTA bbox
     df = df[(df["lat"].between(43.0, 44.5)) & (df["lon"].between(-80.0, -78.0))]
 
+    # Projected coords (UTM 17N, meters), computed once here for every consumer
+    df["x_utm"], df["y_utm"] = project_utm(df["lat"].to_numpy(), df["lon"].to_numpy())
+
     # Normalize status & ward
     if status_col:
         df["status_clean"] = df[status_col].astype(str).str.strip().str.lower()
@@ -98,7 +103,7 @@ def main():
         df["ward_num"] = pd.NA
 
     # Build tidy output
-    out_cols = ["lon","lat","status_clean","ward_num"]
+    out_cols = ["lon","lat","x_utm","y_utm","status_clean","ward_num"]
     if loc_col: out_cols.append(loc_col)
     # keep original FID if exists
     if "fid" in df.columns: out_cols.append("fid")
@@ -3,6 +3,8 @@ from pathlib import Path
 import pandas as pd
 import numpy as np
 
+from spatial_index import build_sphere_tree, count_within_haversine, nearest_haversine, project_utm
+
 # config
 CLEAN = Path("data_clean")
 MODEL = Path("data_model"); MODEL.mkdir(parents=True, exist_ok=True)
@@ -14,7 +16,7 @@ WEATHER_CSV   = CLEAN / "weather_clean.csv"
 CAMERAS_PQ    = CLEAN / "speed_cameras_clean.parquet"
 CAMERAS_CSV   = CLEAN / "speed_cameras_clean.csv"
 
-NEAR_THRESHOLD_M = 250  # distance for near-camera flag
+CAM_RADII_M = [100, 250, 500, 1000]  # ring radii for cam_count_within_{r}m / cam_within_{r}m
 
 #utils -
 def load_any(pq: Path, csv: Path) -> pd.DataFrame:
@@ -52,20 +54,21 @@ def ensure_precip_day(wx: pd.DataFrame) -> pd.DataFrame:
                         (pd.to_numeric(s, errors="coerce").fillna(0) > 0)).astype("int8")
     return wx
 
-def haversine_m(lat1, lon1, lat2, lon2):
-    """Vectorized Haversine distance (meters). Inputs in radians."""
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = np.sin(dlat/2.0)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2.0)**2
-    c = 2 * np.arcsin(np.sqrt(a))
-    return 6371000.0 * c  # Earth radius (m)
+def empty_camera_cols(df: pd.DataFrame, radii_m) -> pd.DataFrame:
+    """Camera columns with no camera data: nearest distance unknown, nothing within any ring."""
+    df["cam_nearest_m"] = np.nan
+    for r in radii_m:
+        df[f"cam_count_within_{r}m"] = np.int32(0)
+        df[f"cam_within_{r}m"] = np.int8(0)
+    return df
 
-def attach_nearest_camera(collisions: pd.DataFrame, cams: pd.DataFrame, threshold_m: float) -> pd.DataFrame:
-    """Attach nearest speed camera distance/attrs. Works with numpy only; chunks to keep memory low."""
+def attach_nearest_camera(collisions: pd.DataFrame, cams: pd.DataFrame, radii_m) -> pd.DataFrame:
+    """
+    Attach nearest speed camera distance/attrs plus per-radius camera counts/flags.
+    One KD-tree per camera table; O(N log M) lookups and a single range query for all radii.
+    """
     if collisions.empty or cams.empty:
-        collisions["cam_nearest_m"] = np.nan
-        collisions["cam_within_250m"] = np.int8(0)
-        return collisions
+        return empty_camera_cols(collisions, radii_m)
 
     # require lon/lat columns in both
     for c in ["lat","lon"]:
@@ -74,44 +77,38 @@ def attach_nearest_camera(collisions: pd.DataFrame, cams: pd.DataFrame, threshol
         if c not in cams.columns:
             raise ValueError(f"cameras missing '{c}'")
 
-    # radians
-    coll_ok = collisions[collisions[["lat","lon"]].notna().all(axis=1)].copy()
+    coll_ok = collisions[collisions[["lat","lon"]].notna().all(axis=1)]
     coll_idx = coll_ok.index.to_numpy()
-    lat1 = np.radians(coll_ok["lat"].to_numpy())
-    lon1 = np.radians(coll_ok["lon"].to_numpy())
-
-    lat2 = np.radians(pd.to_numeric(cams["lat"], errors="coerce").to_numpy())
-    lon2 = np.radians(pd.to_numeric(cams["lon"], errors="coerce").to_numpy())
-
-    # prepare outputs
-    nearest_m = np.full(coll_ok.shape[0], np.nan, dtype=float)
-    nearest_j = np.full(coll_ok.shape[0], -1, dtype=int)
-
-    # chunk over collisions to limit (N x M) memory
-    M = len(cams)
-    CHUNK = 50000
-    for start in range(0, coll_ok.shape[0], CHUNK):
-        end = min(start + CHUNK, coll_ok.shape[0])
-        # broadcast distances: (chunk, M)
-        d = haversine_m(lat1[start:end, None], lon1[start:end, None], lat2[None, :], lon2[None, :])
-        j = np.argmin(d, axis=1)
-        nearest_j[start:end] = j
-        nearest_m[start:end] = d[np.arange(end - start), j]
+
+    # index only cameras with usable coords; keep positions into the full table
+    cam_lat = pd.to_numeric(cams["lat"], errors="coerce").to_numpy()
+    cam_lon = pd.to_numeric(cams["lon"], errors="coerce").to_numpy()
+    cam_pos = np.flatnonzero(~(np.isnan(cam_lat) | np.isnan(cam_lon)))
+    attach_cols = [c for c in ["location","status_clean","ward_num","fid"] if c in cams.columns]
+    if not len(cam_pos):
+        # no camera with coordinates: nothing to look up
+        for c in attach_cols:
+            collisions[f"cam_{c}"] = np.nan
+        return empty_camera_cols(collisions, radii_m)
+    tree = build_sphere_tree(cam_lat[cam_pos], cam_lon[cam_pos])
+
+    nearest_m, j = nearest_haversine(tree, coll_ok["lat"].to_numpy(), coll_ok["lon"].to_numpy())
+    nearest_j = np.where(j >= 0, cam_pos[np.maximum(j, 0)], -1)
 
     # write back into full collisions df at matching indices
     collisions.loc[coll_idx, "cam_nearest_m"] = nearest_m
-    collisions["cam_within_250m"] = (collisions["cam_nearest_m"] <= threshold_m).fillna(False).astype("int8")
+
+    # camera rings: counts within each radius, flag = at least one camera
+    counts = count_within_haversine(tree, collisions["lat"].to_numpy(), collisions["lon"].to_numpy(), radii_m)
+    for k, r in enumerate(radii_m):
+        collisions[f"cam_count_within_{r}m"] = counts[:, k]
+        collisions[f"cam_within_{r}m"] = (counts[:, k] > 0).astype("int8")
 
     # attach a few camera attributes for the nearest camera (optional, if present)
-    attach_cols = [c for c in ["location","status_clean","ward_num","fid"] if c in cams.columns]
     if attach_cols:
-        # build small frame of nearest camera attrs
-        nearest_attrs = pd.DataFrame(index=coll_idx)
         for c in attach_cols:
             vals = cams[c].to_numpy()
-            nearest_attrs[f"cam_{c}"] = vals[nearest_j[np.arange(nearest_attrs.shape[0])]]
-        for c in nearest_attrs.columns:
-            collisions.loc[coll_idx, c] = nearest_attrs[c].values
+            collisions.loc[coll_idx, f"cam_{c}"] = vals[nearest_j]
 
     return collisions
 
@@ -148,14 +145,16 @@ def main():
         df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
     df["wx_precip_amount_any"] = df[amount_cols].max(axis=1) if amount_cols else 0.0
 
+    # Projected coords (UTM 17N, meters) so analyses can skip the per-script to_crs pass
+    df["x_utm"], df["y_utm"] = project_utm(df["lat"].to_numpy(), df["lon"].to_numpy())
+
     # Optional: attach nearest speed camera if the file exists
     if CAMERAS_PQ.exists() or CAMERAS_CSV.exists():
         cams = load_any(CAMERAS_PQ, CAMERAS_CSV)
-        df = attach_nearest_camera(df, cams, NEAR_THRESHOLD_M)
-        print(f"Nearest camera attached (≤ {NEAR_THRESHOLD_M} m flag in 'cam_within_250m').")
+        df = attach_nearest_camera(df, cams, CAM_RADII_M)
+        print(f"Nearest camera attached (rings {CAM_RADII_M} m in 'cam_count_within_{{r}}m' / 'cam_within_{{r}}m').")
     else:
-        df["cam_nearest_m"] = np.nan
-        df["cam_within_250m"] = np.int8(0)
+        df = empty_camera_cols(df, CAM_RADII_M)
         print("No camera file found; skipping camera enrichment.")
 
     # Basic sanity prints
@@ -0,0 +1,103 @@
+# scripts/spatial_index.py
+from functools import lru_cache
+import numpy as np
+from pyproj import Transformer
+from scipy.spatial import cKDTree
+
+EARTH_RADIUS_M = 6371000.0  # same radius as the original haversine_m in 04_merge_enrich
+UTM_EPSG = "EPSG:32617"     # WGS 84 / UTM zone 17N, the metric CRS used by every analysis
+
+#utils -
+def to_unit_xyz(lat, lon) -> np.ndarray:
+    """Lat/lon in degrees -> (N, 3) points on the unit sphere."""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+def chord_to_m(chord):
+    """Unit-sphere chord length -> great-circle (haversine) distance in meters."""
+    return 2.0 * EARTH_RADIUS_M * np.arcsin(np.clip(np.asarray(chord) / 2.0, 0.0, 1.0))
+
+def build_sphere_tree(lat, lon) -> cKDTree:
+    """
+    KD-tree over points on the unit sphere. Chord length grows monotonically with
+    great-circle distance, so nearest/radius queries match a brute-force haversine.
+    Build once per camera table and reuse for every collision batch.
+    """
+    return cKDTree(to_unit_xyz(lat, lon))
+
+def nearest_haversine(tree: cKDTree, lat, lon):
+    """
+    Nearest tree point for each (lat, lon). O(N log M).
+    Returns (distance_m, index); rows with missing coords get (nan, -1).
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    dist_m = np.full(lat.shape[0], np.nan, dtype=float)
+    idx = np.full(lat.shape[0], -1, dtype=int)
+
+    ok = ~(np.isnan(lat) | np.isnan(lon))
+    if ok.any() and tree.n > 0:
+        chord, j = tree.query(to_unit_xyz(lat[ok], lon[ok]), k=1)
+        dist_m[ok] = chord_to_m(chord)
+        idx[ok] = j
+    return dist_m, idx
+
+def m_to_chord(dist_m):
+    """Great-circle distance in meters -> unit-sphere chord length (inverse of chord_to_m)."""
+    return 2.0 * np.sin(np.asarray(dist_m, dtype=float) / (2.0 * EARTH_RADIUS_M))
+
+def count_within_haversine(tree: cKDTree, lat, lon, radii_m) -> np.ndarray:
+    """
+    Number of tree points within each radius (meters) of every (lat, lon).
+    A single range query at the largest radius serves all radii.
+    Returns an (N, len(radii_m)) int array; rows with missing coords count 0.
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    radii = np.asarray(radii_m, dtype=float)
+    counts = np.zeros((lat.shape[0], radii.shape[0]), dtype=np.int32)
+
+    ok = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+    if ok.size == 0 or tree.n == 0 or radii.size == 0:
+        return counts
+
+    pts = cKDTree(to_unit_xyz(lat[ok], lon[ok]))
+    # small slack so pairs sitting exactly on the largest radius are not lost to rounding
+    pairs = pts.sparse_distance_matrix(tree, m_to_chord(radii.max()) * (1 + 1e-9), output_type="ndarray")
+    dist_m = chord_to_m(pairs["v"])
+    for k, r in enumerate(radii):
+        counts[ok, k] = np.bincount(pairs["i"][dist_m <= r], minlength=ok.size)
+    return counts
+
+def within_radius(tree: cKDTree, xy, radii_m, dist_m=None) -> np.ndarray:
+    """
+    "Within r meters of any tree point" for planar (UTM) points: one nearest-neighbour query,
+    then a distance comparison per radius (dist_m: reuse distances from an earlier tree.query).
+    Same flags as geometry.within(unary_union of r-buffers), without the polygon; the buffers
+    are polygons inscribed in the circles, so only points within ~1 m inside a circle's edge
+    can differ. Returns an (N,) bool array for a scalar radius, else (N, len(radii_m)).
+    """
+    xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+    radii = np.asarray(radii_m, dtype=float)
+    if dist_m is None:
+        dist_m = np.full(xy.shape[0], np.inf)
+        ok = np.isfinite(xy).all(axis=1)
+        if ok.any() and tree.n > 0:
+            dist_m[ok] = tree.query(xy[ok], k=1, distance_upper_bound=radii.max() * (1 + 1e-9))[0]
+    dist_m = np.asarray(dist_m, dtype=float)
+    flags = dist_m[:, None] <= radii.ravel()[None, :]
+    return flags[:, 0] if radii.ndim == 0 else flags
+
+@lru_cache(maxsize=None)
+def get_transformer(src: str, dst: str) -> Transformer:
+    """Cached pyproj Transformer (building one is far slower than using it)."""
+    return Transformer.from_crs(src, dst, always_xy=True)
+
+def project_utm(lat, lon):
+    """Vectorized lat/lon (degrees) -> UTM 17N x/y (meters). NaN in, NaN out."""
+    x, y = get_transformer("EPSG:4326", UTM_EPSG).transform(
+        np.asarray(lon, dtype=float), np.asarray(lat, dtype=float)
+    )
+    return np.asarray(x, dtype=float), np.asarray(y, dtype=float)
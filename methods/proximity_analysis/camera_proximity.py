@@ -0,0 +1,53 @@
+# methods/proximity_analysis/camera_proximity.py
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "data" / "preprocessing"))  # shared spatial helpers
+from spatial_index import build_sphere_tree, nearest_haversine
+
+BUFFER_M = 500  # Near / Far split used by the proximity analysis
+
+#utils -
+def nearest_camera(lat, lon, cam_lat, cam_lon, cam_ids=None, buffer_m: float = BUFFER_M,
+                   tree=None) -> pd.DataFrame:
+    """
+    Nearest speed camera for arrays of lat/lon in one KD-tree query on unit-sphere chords. The
+    distance is the great-circle distance in meters on R = 6371 km (spatial_index.EARTH_RADIUS_M);
+    the haversine package's 6371.0088 km mean radius gives ~1.4 ppm larger values. Pass tree
+    (build_sphere_tree of the cameras) to reuse it across batches. Rows with missing coords get NaN distance, camera id NaN and
+    category NaN.
+    Returns nearest_camera_dist_m, nearest_camera_id, distance_category ("Near" / "Far").
+    """
+    cam_lat = np.asarray(cam_lat, dtype=float)
+    cam_lon = np.asarray(cam_lon, dtype=float)
+    cam_ok = ~(np.isnan(cam_lat) | np.isnan(cam_lon))
+    cam_ids = np.arange(cam_lat.shape[0]) if cam_ids is None else np.asarray(cam_ids)
+    if tree is None:
+        tree = build_sphere_tree(cam_lat[cam_ok], cam_lon[cam_ok])
+        cam_ids = cam_ids[cam_ok]
+
+    dist_m, j = nearest_haversine(tree, lat, lon)
+    found = j >= 0
+    ids = np.full(dist_m.shape[0], np.nan, dtype=object)
+    ids[found] = cam_ids[j[found]]
+    category = np.where(dist_m <= buffer_m, "Near", "Far").astype(object)
+    category[~found] = np.nan
+    return pd.DataFrame({
+        "nearest_camera_dist_m": dist_m,
+        "nearest_camera_id": ids,
+        "distance_category": category,
+    })
+
+def attach_nearest_camera(collisions: pd.DataFrame, speed_cameras: pd.DataFrame, id_col: str = "fid",
+                          buffer_m: float = BUFFER_M) -> pd.DataFrame:
+    """Copy of collisions with the nearest_camera columns (camera ids from id_col if present, else row positions)."""
+    ids = speed_cameras[id_col].to_numpy() if id_col in speed_cameras.columns else None
+    near = nearest_camera(collisions["lat"].to_numpy(), collisions["lon"].to_numpy(),
+                          speed_cameras["lat"].to_numpy(), speed_cameras["lon"].to_numpy(),
+                          cam_ids=ids, buffer_m=buffer_m)
+    out = collisions.copy()
+    for c in near.columns:
+        out[c] = near[c].to_numpy()
+    return out
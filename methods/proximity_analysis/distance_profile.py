@@ -0,0 +1,106 @@
+# methods/proximity_analysis/distance_profile.py
+import numpy as np
+import pandas as pd
+
+DIST_COL = "cam_nearest_m"  # nearest-camera distance written by 04_merge_enrich
+DEFAULT_EDGES = np.arange(0, 5001, 250)
+
+#utils -
+def distance_index(collisions: pd.DataFrame, dist_col: str = DIST_COL, weight_col: str = None) -> dict:
+    """
+    Sort the nearest-camera distances once and keep, in the same order, running totals of
+    collisions, injury / fatal collisions (severity other than Property Damage Only),
+    precipitation-day collisions and an optional weight. Every count below a threshold is then
+    one searchsorted plus a lookup. Rows without a distance are left out.
+    """
+    d = pd.to_numeric(collisions[dist_col], errors="coerce").to_numpy(dtype=float)
+    ok = ~np.isnan(d)
+    order = np.argsort(d[ok], kind="stable")
+    pos = np.flatnonzero(ok)[order]
+
+    flags = {"injury": collisions["severity"].to_numpy()[pos] != "Property Damage Only"
+             if "severity" in collisions.columns else np.zeros(pos.size, dtype=bool)}
+    if "wx_precip_day" in collisions.columns:
+        flags["precip"] = pd.to_numeric(collisions["wx_precip_day"], errors="coerce").fillna(0).to_numpy()[pos] > 0
+    if weight_col is not None:
+        flags["weight"] = pd.to_numeric(collisions[weight_col], errors="coerce").fillna(0).to_numpy(dtype=float)[pos]
+
+    return {
+        "dist": d[pos],
+        "pos": pos,  # row positions in sorted order (for group subsets)
+        "cum": {k: np.concatenate([[0.0], np.cumsum(v, dtype=float)]) for k, v in flags.items()},
+        "n": pos.size,
+    }
+
+def subset_index(index: dict, mask_sorted: np.ndarray) -> dict:
+    """Index of a subset given as a mask over the sorted rows (no re-sort: the subset stays sorted)."""
+    keep = np.flatnonzero(mask_sorted)
+    cum = {k: np.concatenate([[0.0], np.cumsum(np.diff(c)[keep])]) for k, c in index["cum"].items()}
+    return {"dist": index["dist"][keep], "pos": index["pos"][keep], "cum": cum, "n": keep.size}
+
+def count_within(index: dict, thresholds) -> np.ndarray:
+    """Collisions with distance <= each threshold."""
+    return np.searchsorted(index["dist"], np.asarray(thresholds, dtype=float), side="right")
+
+def threshold_profile(index: dict, thresholds) -> pd.DataFrame:
+    """
+    Near / Far split at many thresholds: collisions within each threshold, their share of all
+    collisions (exposure to a camera at that distance) and the injury share on each side.
+    """
+    t = np.asarray(thresholds, dtype=float)
+    k = count_within(index, t)
+    n = index["n"]
+    inj = index["cum"]["injury"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = pd.DataFrame({
+            "threshold_m": t,
+            "near": k,
+            "far": n - k,
+            "near_share": k / n if n else np.zeros(t.size),
+            "near_injury_share": inj[k] / k,
+            "far_injury_share": (inj[-1] - inj[k]) / (n - k),
+        })
+    return out
+
+def bin_profile(index: dict, edges=DEFAULT_EDGES) -> pd.DataFrame:
+    """
+    Distance-decay curve over bins [edges[0], edges[1]], (edges[1], edges[2]], ... (the first
+    bin keeps its left edge, so 0 m collisions count): collisions, share of all collisions,
+    cumulative share, injury share, precipitation-day share and summed weight per bin.
+    """
+    e = np.asarray(edges, dtype=float)
+    if e.size < 2 or np.any(np.diff(e) <= 0):
+        raise ValueError("edges must be at least two increasing distances")
+    k = count_within(index, e)
+    k[0] = np.searchsorted(index["dist"], e[0], side="left")
+    counts = np.diff(k)  # sums to count_within(edges[-1]) when edges[0] <= the smallest distance
+    n = index["n"]
+    out = {"bin_start_m": e[:-1], "bin_end_m": e[1:], "collisions": counts,
+           "share": counts / n if n else np.zeros(counts.size),
+           "cumulative_share": k[1:] / n if n else np.zeros(counts.size)}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for name, c in index["cum"].items():
+            per_bin = np.diff(c[k])
+            if name == "weight":
+                out["weight"] = per_bin
+            else:
+                out[f"{name}_share"] = per_bin / counts
+    return pd.DataFrame(out)
+
+def decay_curves(collisions: pd.DataFrame, edges=DEFAULT_EDGES, by=("severity", "wx_precip_day"),
+                 dist_col: str = DIST_COL, weight_col: str = None) -> pd.DataFrame:
+    """
+    bin_profile for all collisions ("all") and for every level of each `by` column, from one
+    sorted index. Returns the curves stacked with group / level columns.
+    """
+    index = distance_index(collisions, dist_col, weight_col)
+    curves = [bin_profile(index, edges).assign(group="all", level="all")]
+    for col in by:
+        if col not in collisions.columns:
+            continue
+        values = collisions[col].to_numpy()[index["pos"]]
+        for level in pd.unique(values[~pd.isna(values)]):
+            sub = subset_index(index, values == level)
+            curves.append(bin_profile(sub, edges).assign(group=col, level=level))
+    out = pd.concat(curves, ignore_index=True)
+    return out[["group", "level"] + [c for c in out.columns if c not in ("group", "level")]]
@@ -18,28 +18,15 @@ collisions[['lat', 'lon']].head()
 
 speed_cameras[['lat', 'lon']].head()
 
-!pip install haversine
-
-from haversine import haversine, Unit
 import folium
 import seaborn as sns
 import matplotlib.pyplot as plt
 
-camera_coords = list(zip(speed_cameras['lat'], speed_cameras['lon']))
-
-def nearest_camera_distance(collision_point):
-    distances = [haversine(collision_point, cam, unit=Unit.METERS) for cam in camera_coords]
-    return min(distances)
-
-collisions['nearest_camera_dist_m'] = collisions.apply(
-    lambda row: nearest_camera_distance((row['lat'], row['lon'])),
-    axis=1
-)
+from camera_proximity import attach_nearest_camera
 
+# nearest camera for every collision in one KD-tree query (great-circle meters on R = 6371 km)
 buffer = 500  # metres
-collisions['distance_category'] = collisions['nearest_camera_dist_m'].apply(
-    lambda d: 'Near' if d <= buffer else 'Far'
-)
+collisions = attach_nearest_camera(collisions, speed_cameras, buffer_m=buffer)
 
 sns.countplot(x='distance_category', data=collisions, palette=['green', 'red'])
 plt.title("Collisions by Distance to Nearest Speed Camera")
@@ -0,0 +1,237 @@
+# methods/regression/grid_aggregation.py
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import shapely
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "data" / "preprocessing"))  # shared spatial helpers
+from spatial_index import project_utm
+
+CELL_SIZE_M = 500
+BASE_CELL_M = 50                       # finest lattice; every square size below is a multiple of it
+SQUARE_SIZES_M = (100, 250, 500, 1000)
+HEX_SIZE_M = 500                       # flat-to-flat width of a hex cell
+DOWNTOWN_BBOX = (-79.42, 43.63, -79.34, 43.67)  # lon/lat box used for the downtown flag
+
+# collision column -> grid column (cell mean; 0 for empty cells)
+MEAN_COLS = {
+    "cam_nearest_m": "mean_dist_to_camera",
+    "wx_precipitation": "mean_precip",
+    "wx_snow": "mean_snow",
+}
+
+#utils -
+def utm_xy(df: pd.DataFrame):
+    """x/y in UTM 17N meters: persisted x_utm/y_utm if present, else projected from lat/lon."""
+    if {"x_utm", "y_utm"}.issubset(df.columns):
+        return (pd.to_numeric(df["x_utm"], errors="coerce").to_numpy(),
+                pd.to_numeric(df["y_utm"], errors="coerce").to_numpy())
+    return project_utm(pd.to_numeric(df["lat"], errors="coerce").to_numpy(),
+                       pd.to_numeric(df["lon"], errors="coerce").to_numpy())
+
+def downtown_polygon():
+    """Downtown box projected to UTM (corner by corner, like GeoSeries.to_crs)."""
+    lon0, lat0, lon1, lat1 = DOWNTOWN_BBOX
+    x, y = project_utm([lat0, lat0, lat1, lat1], [lon1, lon0, lon0, lon1])
+    return shapely.Polygon(np.column_stack([x, y]))
+
+def grid_shape(index: dict, cell_size: int):
+    """Columns/rows of a square grid anchored at the index origin (same extent as the old box() loops)."""
+    n_cols = len(range(index["x0"], int(index["xmax"]) + cell_size, cell_size))
+    n_rows = len(range(index["y0"], int(index["ymax"]) + cell_size, cell_size))
+    return n_cols, n_rows
+
+def key_sums(keys: np.ndarray, values: dict) -> pd.DataFrame:
+    """
+    Sort the cell keys once and reduce per key: collision count plus sum and
+    non-null count of each value column (so means can be rolled up exactly).
+    """
+    uniq, inv = np.unique(keys, return_inverse=True)
+    out = {"key": uniq, "collision_count": np.bincount(inv, minlength=uniq.size)}
+    for col, v in values.items():
+        ok = ~np.isnan(v)
+        out[f"{col}_sum"] = np.bincount(inv[ok], weights=v[ok], minlength=uniq.size)
+        out[f"{col}_n"] = np.bincount(inv[ok], minlength=uniq.size)
+    return pd.DataFrame(out)
+
+def finish_stats(sums: pd.DataFrame, n_cells: int) -> pd.DataFrame:
+    """Per-cell sums (indexed by cell id) -> collision_count + mean columns for cells 0..n_cells-1."""
+    sums = sums.reindex(np.arange(n_cells), fill_value=0)
+    out = pd.DataFrame({"collision_count": sums["collision_count"].astype(int).to_numpy()})
+    for col, name in MEAN_COLS.items():
+        n = sums[f"{col}_n"].to_numpy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = sums[f"{col}_sum"].to_numpy() / n
+        # empty cell -> 0 (as before); collisions present but all values missing -> NaN
+        out[name] = np.where(out["collision_count"].to_numpy() == 0, 0.0, mean)
+    return out
+
+def collision_values(collisions: pd.DataFrame) -> dict:
+    missing = [c for c in MEAN_COLS if c not in collisions.columns]
+    if missing:
+        raise ValueError(f"collisions are missing the MEAN_COLS columns {missing}")
+    return {c: pd.to_numeric(collisions[c], errors="coerce").to_numpy(dtype=float) for c in MEAN_COLS}
+
+# cell-key index
+def cell_index(collisions: pd.DataFrame, cameras: pd.DataFrame, base_cell: int = BASE_CELL_M) -> dict:
+    """
+    One binning pass over the collisions: integer (ix, iy) on a base_cell lattice anchored at
+    int(min x), int(min y), reduced to one row per occupied base cell, sorted by key (column-major).
+    Cameras keep their base (ix, iy) so each resolution can apply its own extent.
+    Every square grid whose size is a multiple of base_cell rolls up from this without rescanning.
+    """
+    cx, cy = utm_xy(collisions)
+    ok = ~(np.isnan(cx) | np.isnan(cy))
+    index = {
+        "base_cell": base_cell,
+        "x0": int(np.nanmin(cx)), "y0": int(np.nanmin(cy)),
+        "xmax": float(np.nanmax(cx)), "ymax": float(np.nanmax(cy)),
+    }
+
+    ix = np.floor((cx[ok] - index["x0"]) / base_cell).astype(np.int64)
+    iy = np.floor((cy[ok] - index["y0"]) / base_cell).astype(np.int64)
+    values = {c: v[ok] for c, v in collision_values(collisions).items()}
+    cells = key_sums((ix << 32) | iy, values)
+    cells["ix"] = cells["key"].to_numpy() >> 32
+    cells["iy"] = cells["key"].to_numpy() & 0xFFFFFFFF
+    index["cells"] = cells
+
+    kx, ky = utm_xy(cameras)
+    kok = ~(np.isnan(kx) | np.isnan(ky))
+    index["cam_ix"] = np.floor((kx[kok] - index["x0"]) / base_cell).astype(np.int64)
+    index["cam_iy"] = np.floor((ky[kok] - index["y0"]) / base_cell).astype(np.int64)
+    return index
+
+def rollup(index: dict, cell_size: int) -> pd.DataFrame:
+    """Square grid of cell_size meters rolled up from the base-cell index."""
+    base = index["base_cell"]
+    if cell_size % base:
+        raise ValueError(f"cell_size {cell_size} is not a multiple of the base cell {base}")
+    f = cell_size // base
+    n_cols, n_rows = grid_shape(index, cell_size)
+    n_cells = n_cols * n_rows
+
+    cells = index["cells"]
+    cid = (cells["ix"] // f) * n_rows + (cells["iy"] // f)
+    sum_cols = [c for c in cells.columns if c not in ("key", "ix", "iy")]
+    stats = finish_stats(cells[sum_cols].groupby(cid.to_numpy()).sum(), n_cells)
+
+    # cameras off this grid's extent are ignored, as before
+    cix, ciy = index["cam_ix"] // f, index["cam_iy"] // f
+    on = (cix >= 0) & (cix < n_cols) & (ciy >= 0) & (ciy < n_rows)
+    camera_count = np.bincount(cix[on] * n_rows + ciy[on], minlength=n_cells)
+
+    # cell geometry only for the downtown test
+    cell = np.arange(n_cells)
+    left = index["x0"] + (cell // n_rows) * cell_size
+    bottom = index["y0"] + (cell % n_rows) * cell_size
+    boxes = shapely.box(left, bottom, left + cell_size, bottom + cell_size)
+
+    return pd.DataFrame({
+        "cell_id": cell,
+        "x_coord": (left + cell_size / 2).astype(float),
+        "y_coord": (bottom + cell_size / 2).astype(float),
+        "collision_count": stats["collision_count"].to_numpy(),
+        "camera_count": camera_count,
+        "mean_dist_to_camera": stats["mean_dist_to_camera"].to_numpy(),
+        "mean_precip": stats["mean_precip"].to_numpy(),
+        "mean_snow": stats["mean_snow"].to_numpy(),
+        "downtown": shapely.intersects(boxes, downtown_polygon()).astype(int),
+    })
+
+def build_grid(collisions: pd.DataFrame, cameras: pd.DataFrame, cell_size: int = CELL_SIZE_M) -> pd.DataFrame:
+    """
+    Square grid over the collision extent with the regression / optimization columns:
+    collision_count, camera_count, mean_dist_to_camera, mean_precip, mean_snow, downtown.
+    One vectorized binning pass per table; x_coord/y_coord are cell centroids and
+    cell_id = col * n_rows + row. Empty cells get 0 for the means, as before.
+    """
+    return rollup(cell_index(collisions, cameras, base_cell=cell_size), cell_size)
+
+# hex grid
+def hex_axial(x, y, size: float):
+    """Pointy-top hex (q, r) for points relative to the grid origin; size = flat-to-flat width."""
+    R = size / np.sqrt(3.0)
+    qf = (np.sqrt(3.0) / 3.0 * x - y / 3.0) / R
+    rf = (2.0 / 3.0 * y) / R
+    # cube rounding
+    sf = -qf - rf
+    q, r, s = np.round(qf), np.round(rf), np.round(sf)
+    dq, dr, ds = np.abs(q - qf), np.abs(r - rf), np.abs(s - sf)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    q = np.where(fix_q, -r - s, q)
+    r = np.where(fix_r, -q - s, r)
+    return q.astype(np.int64), r.astype(np.int64)
+
+def hex_centers(q, r, size: float):
+    R = size / np.sqrt(3.0)
+    return R * np.sqrt(3.0) * (q + r / 2.0), 1.5 * R * r
+
+def hex_grid(collisions: pd.DataFrame, cameras: pd.DataFrame, size: int = HEX_SIZE_M, index: dict = None) -> pd.DataFrame:
+    """
+    Hex grid (pointy-top, flat-to-flat width = size) over the collision extent, same columns as
+    build_grid. Hexes do not tile squares, so their keys come from the point coordinates in one
+    vectorized pass; the origin/extent are shared with the square family via `index`.
+    """
+    index = index or cell_index(collisions, cameras, base_cell=size)
+    x0, y0 = index["x0"], index["y0"]
+    R = size / np.sqrt(3.0)
+
+    # full lattice covering the extent (odd-r offset rows), one hex of margin on every side
+    n_r = int(np.ceil((index["ymax"] - y0) / (1.5 * R))) + 2
+    n_c = int(np.ceil((index["xmax"] - x0) / size)) + 2
+    rr, cc = np.meshgrid(np.arange(-1, n_r), np.arange(-1, n_c), indexing="ij")
+    lattice = pd.DataFrame({"q": cc.ravel() - np.floor_divide(rr.ravel(), 2), "r": rr.ravel()})
+    lattice["cell_id"] = np.arange(len(lattice))  # = (r + 1) * (n_c + 1) + (col + 1)
+
+    def to_cell(x, y):
+        q, r = hex_axial(x - x0, y - y0, size)
+        col = q + np.floor_divide(r, 2)
+        on = (r >= -1) & (r < n_r) & (col >= -1) & (col < n_c)
+        return np.where(on, (r + 1) * (n_c + 1) + (col + 1), -1)
+
+    cx, cy = utm_xy(collisions)
+    ok = ~(np.isnan(cx) | np.isnan(cy))
+    cid = to_cell(cx[ok], cy[ok])
+    values = {c: v[ok][cid >= 0] for c, v in collision_values(collisions).items()}
+    sums = key_sums(cid[cid >= 0], values).set_index("key")
+    stats = finish_stats(sums, len(lattice))
+
+    kx, ky = utm_xy(cameras)
+    kok = ~(np.isnan(kx) | np.isnan(ky))
+    kid = to_cell(kx[kok], ky[kok])
+    camera_count = np.bincount(kid[kid >= 0], minlength=len(lattice))
+
+    hx, hy = hex_centers(lattice["q"].to_numpy(), lattice["r"].to_numpy(), size)
+    hx, hy = hx + x0, hy + y0
+    angles = np.radians(30 + 60 * np.arange(6))
+    rings = np.stack([hx[:, None] + R * np.cos(angles), hy[:, None] + R * np.sin(angles)], axis=-1)
+    hexes = shapely.polygons(rings)
+
+    return pd.DataFrame({
+        "cell_id": lattice["cell_id"].to_numpy(),
+        "x_coord": hx,
+        "y_coord": hy,
+        "collision_count": stats["collision_count"].to_numpy(),
+        "camera_count": camera_count,
+        "mean_dist_to_camera": stats["mean_dist_to_camera"].to_numpy(),
+        "mean_precip": stats["mean_precip"].to_numpy(),
+        "mean_snow": stats["mean_snow"].to_numpy(),
+        "downtown": shapely.intersects(hexes, downtown_polygon()).astype(int),
+    })
+
+# grid family
+def build_grid_family(collisions: pd.DataFrame, cameras: pd.DataFrame,
+                      sizes=SQUARE_SIZES_M, hex_size: int = HEX_SIZE_M,
+                      base_cell: int = BASE_CELL_M) -> dict:
+    """
+    Square grids for every size in `sizes` plus a hex grid, keyed "square_{size}m" / "hex_{size}m".
+    The squares all roll up from one base-cell index (one pass over the collisions).
+    """
+    index = cell_index(collisions, cameras, base_cell=base_cell)
+    family = {f"square_{s}m": rollup(index, s) for s in sizes}
+    if hex_size:
+        family[f"hex_{hex_size}m"] = hex_grid(collisions, cameras, hex_size, index=index)
+    return family
@@ -23,73 +23,12 @@ collisions.head()
 print("\nSpeed cameras data:")
 speed_cameras[speed_cameras['status_clean'] == 'active']
 
-import geopandas as gpd
-from shapely.geometry import Point
-
-# convert collisions to GeoDataFrame
-collisions_gdf = gpd.GeoDataFrame(
-    collisions,
-    geometry=gpd.points_from_xy(collisions.lon, collisions.lat),
-    crs="EPSG:4326"
-).to_crs("EPSG:3857")
-
-# convert cameras to GeoDataFrame
-speed_gdf = gpd.GeoDataFrame(
-    speed_cameras,
-    geometry=gpd.points_from_xy(speed_cameras.lon, speed_cameras.lat),
-    crs="EPSG:4326"
-).to_crs("EPSG:3857")
-
-from shapely.geometry import box
-
-collisions_gdf = collisions_gdf.to_crs(epsg=32617)
-speed_gdf = speed_gdf.to_crs(epsg=32617)
-
-# create a spatial grid (500m x 500m) to aggregate collisions
-xmin, ymin, xmax, ymax = collisions_gdf.total_bounds
-cell_size = 500  # in meters
-
-cols = list(range(int(xmin), int(xmax) + cell_size, cell_size))
-rows = list(range(int(ymin), int(ymax) + cell_size, cell_size))
-
-grid_cells = []
-for x in cols:
-    for y in rows:
-        grid_cells.append(box(x, y, x + cell_size, y + cell_size))
-
-grid = gpd.GeoDataFrame({'geometry': grid_cells}, crs=collisions_gdf.crs)
-
-# changed to .intersects(poly)
-grid["collision_count"] = grid.geometry.apply(
-    lambda poly: collisions_gdf.intersects(poly).sum()
-)
-
-grid["camera_count"] = grid.geometry.apply(
-    lambda poly: speed_gdf.intersects(poly).sum()
-)
-
-def mean_dist(poly):
-    pts = collisions_gdf[collisions_gdf.intersects(poly)]
-    return pts["cam_nearest_m"].mean() if len(pts) > 0 else 0
+from grid_aggregation import build_grid
 
-grid["mean_dist_to_camera"] = grid.geometry.apply(mean_dist)
-
-def mean_col(poly, col):
-    pts = collisions_gdf[collisions_gdf.intersects(poly)]
-    return pts[col].mean() if len(pts) > 0 else 0
-
-grid["mean_precip"] = grid.geometry.apply(lambda p: mean_col(p, "wx_precipitation"))
-grid["mean_snow"]   = grid.geometry.apply(lambda p: mean_col(p, "wx_snow"))
-
-# Downtown Toronto
-downtown_poly = gpd.GeoSeries(
-    [box(-79.42, 43.63, -79.34, 43.67)],
-    crs="EPSG:4326"
-).to_crs(32617)[0]
-
-grid["downtown"] = grid.geometry.apply(
-    lambda g: 1 if g.intersects(downtown_poly) else 0
-)
+# 500m x 500m grid: every collision/camera binned to a cell id in one vectorized pass,
+# then one groupby for the cell stats (uses persisted x_utm/y_utm when available)
+cell_size = 500  # in meters
+grid = build_grid(collisions, speed_cameras, cell_size=cell_size)
 
 import statsmodels.formula.api as smf
 import statsmodels.api as sm
@@ -113,6 +52,23 @@ print(f"IRR for camera_count: {irr_camera_count:.3f}") # Incidence Rate Ratio (I
 
 grid["lambda"] = model2.predict(grid)
 
+grid.to_csv("grid_for_optimization.csv", index=False)
+
+# same model on every resolution of the grid family (100m-1km squares + 500m hexes),
+# all rolled up from one cell-key index so the collisions are binned once
+from grid_aggregation import build_grid_family
+
+grid_family = build_grid_family(collisions, speed_cameras)
+for name, g in grid_family.items():
+    fit = smf.glm(
+        formula="collision_count ~ camera_count + mean_dist_to_camera + mean_precip + mean_snow + downtown",
+        data=g,
+        family=sm.families.NegativeBinomial()
+    ).fit()
+    g["lambda"] = fit.predict(g)
+    g.to_csv(f"grid_for_optimization_{name}.csv", index=False)
+    print(f"{name}: {len(g):,} cells, {int((g['collision_count'] > 0).sum()):,} with collisions")
+
 """## Model 2: Negative Binomial Regression Results
 
 This model predicts the **count of collisions** within 500m × 500m spatial grid cells using the number of speed cameras (`camera_count`) in each cell.
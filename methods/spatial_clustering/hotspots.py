@@ -0,0 +1,112 @@
+# methods/spatial_clustering/hotspots.py
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+EPS_M = 300       # DBSCAN(eps=300, min_samples=5) of baseline / spatial_point_analysis
+MIN_SAMPLES = 5
+CHUNK = 20000     # grid-ordered points per neighbour query
+
+#utils -
+def neighbor_graph(xy, eps_max: float = EPS_M, chunk: int = CHUNK) -> dict:
+    """
+    Radius-neighbour graph of the collision points, built once at the largest eps of a sweep.
+    Repeated coordinates (many collisions share an intersection) are collapsed to one node
+    with a count, then nodes are bucketed on an eps_max grid and queried a bucket-ordered
+    chunk at a time, so each query touches a compact area and only int32 node ids and the
+    distances are kept. Returns {"inverse": point -> node, "counts", "graph": CSR of node distances
+    (self excluded)}.
+    """
+    xy = np.asarray(xy, dtype=float)
+    nodes, inverse, counts = np.unique(xy, axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+    n = nodes.shape[0]
+
+    cell = np.floor((nodes - nodes.min(axis=0)) / eps_max).astype(np.int64)
+    order = np.lexsort((cell[:, 1], cell[:, 0]))
+    tree = cKDTree(nodes)
+    rows, cols, dist = [], [], []
+    for start in range(0, n, chunk):
+        part = order[start:start + chunk]
+        pairs = cKDTree(nodes[part]).sparse_distance_matrix(tree, eps_max, output_type="ndarray")
+        i = part[pairs["i"]]
+        keep = i != pairs["j"]
+        rows.append(i[keep].astype(np.int32))
+        cols.append(pairs["j"][keep].astype(np.int32))
+        dist.append(pairs["v"][keep])
+    rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int32)
+    cols = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int32)
+    dist = np.concatenate(dist) if dist else np.zeros(0)
+    graph = sparse.csr_matrix((dist, (rows, cols)), shape=(n, n))
+    graph.sort_indices()
+    return {"inverse": inverse, "counts": counts, "graph": graph, "eps_max": eps_max}
+
+def dbscan_labels(ng: dict, eps: float = EPS_M, min_samples: int = MIN_SAMPLES) -> np.ndarray:
+    """
+    DBSCAN labels (per original point, -1 = noise) from a prebuilt neighbor_graph with
+    eps <= eps_max. Same rules as sklearn DBSCAN: a point is core when at least min_samples
+    points (itself included) lie within eps; clusters are the connected core points; other
+    points within eps of a core point are border points, the rest noise. Clusters are
+    numbered in order of their first core point, as sklearn does. A border point reachable
+    from several clusters joins the lowest-numbered one, the cluster sklearn's expansion
+    reaches it from first, so the labels equal DBSCAN(...).labels_.
+    """
+    if eps > ng["eps_max"]:
+        raise ValueError(f"eps {eps} is larger than the graph radius {ng['eps_max']}")
+    G = ng["graph"]
+    if eps < ng["eps_max"]:
+        G = G.copy()
+        G.data[G.data > eps] = 0
+        G.eliminate_zeros()  # (exact duplicates are merged into nodes, so no kept distance is 0)
+    counts = ng["counts"]
+    n = counts.size
+
+    weighted = counts + G.astype(bool).astype(np.int64) @ counts
+    core = weighted >= min_samples
+
+    core_idx = np.flatnonzero(core)
+    node_label = np.full(n, -1, dtype=np.int64)
+    if core_idx.size:
+        C = G[core_idx][:, core_idx]
+        _, comp = connected_components(C, directed=False)
+        # number clusters by first core point (original point order), like sklearn
+        first_point = np.full(n, np.iinfo(np.int64).max)
+        np.minimum.at(first_point, ng["inverse"], np.arange(ng["inverse"].size))
+        comp_first = np.full(comp.max() + 1, np.iinfo(np.int64).max)
+        np.minimum.at(comp_first, comp, first_point[core_idx])
+        rank = np.empty_like(comp_first)
+        rank[np.argsort(comp_first, kind="stable")] = np.arange(comp_first.size)
+        node_label[core_idx] = rank[comp]
+
+        # border nodes: lowest-numbered cluster among core neighbours within eps (sklearn
+        # expands clusters one at a time in label order, so that one reaches the point first)
+        B = G[~core][:, core_idx].tocoo()
+        if B.nnz:
+            border_label = np.full(n - core_idx.size, np.iinfo(np.int64).max)
+            np.minimum.at(border_label, B.row, node_label[core_idx[B.col]])
+            reached = border_label != np.iinfo(np.int64).max
+            node_label[np.flatnonzero(~core)[reached]] = border_label[reached]
+    return node_label[ng["inverse"]]
+
+def dbscan_sweep(xy, settings, chunk: int = CHUNK) -> tuple:
+    """
+    DBSCAN for many (eps, min_samples) settings from one neighbour graph at the largest eps.
+    Returns (labels frame with one column per setting, e.g. "eps300_min5", summary frame with
+    clusters, hotspot points and noise points per setting).
+    """
+    settings = [(float(e), int(m)) for e, m in settings]
+    ng = neighbor_graph(xy, max(e for e, _ in settings), chunk=chunk)
+    labels, rows = {}, []
+    for eps, m in settings:
+        name = f"eps{eps:g}_min{m}"
+        lab = dbscan_labels(ng, eps, m)
+        labels[name] = lab
+        rows.append({"setting": name, "eps": eps, "min_samples": m, "clusters": int(lab.max() + 1),
+                     "hotspot_points": int((lab != -1).sum()), "noise_points": int((lab == -1).sum())})
+    return pd.DataFrame(labels), pd.DataFrame(rows)
+
+def hotspot_labels(xy, eps: float = EPS_M, min_samples: int = MIN_SAMPLES) -> np.ndarray:
+    """Drop-in for DBSCAN(eps, min_samples).fit(xy).labels_ (the db_cluster column)."""
+    return dbscan_labels(neighbor_graph(xy, eps), eps, min_samples)
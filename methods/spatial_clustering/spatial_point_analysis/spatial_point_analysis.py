@@ -18,11 +18,16 @@ speed_cameras = pd.read_csv("/content/drive/My Drive/UofT/Third Year/Fall/MIE368
 
 import geopandas as gpd
 import numpy as np
-from sklearn.cluster import DBSCAN
 import folium
 from folium.plugins import MarkerCluster, HeatMap
-from sklearn.cluster import DBSCAN
 from haversine import haversine
+from scipy.spatial import cKDTree
+import sys
+
+sys.path.append("../../../data/preprocessing")  # shared spatial helpers
+sys.path.append("..")
+from hotspots import hotspot_labels
+from spatial_index import within_radius
 
 #create GeoDataFrames
 collisions_gdf = gpd.GeoDataFrame(
@@ -41,26 +46,21 @@ cameras_gdf = gpd.GeoDataFrame(
 collisions_utm = collisions_gdf.to_crs(epsg=32617)
 cameras_utm = cameras_gdf.to_crs(epsg=32617)
 
-buffer_radius = 500  # meters
-cameras_utm['buffer'] = cameras_utm.geometry.buffer(buffer_radius)
-all_buffers = cameras_utm['buffer'].unary_union
-
-collisions_utm['within_camera_zone'] = collisions_utm.geometry.within(all_buffers)
-
-# DBSCAN clustering
-coords = np.array(list(zip(collisions_utm.geometry.x, collisions_utm.geometry.y)))
-db = DBSCAN(eps=300, min_samples=5).fit(coords)  # eps=300m, min 5 collisions
-collisions_utm['cluster'] = db.labels_
-
-# find nearest camera distance
+# camera KD-tree: nearest distance and "within buffer_radius of any camera" from one query
 camera_coords = np.array(list(zip(cameras_utm.geometry.x, cameras_utm.geometry.y)))
 collision_coords = np.array(list(zip(collisions_utm.geometry.x, collisions_utm.geometry.y)))
-
-from scipy.spatial import cKDTree
 tree = cKDTree(camera_coords)
 distances, _ = tree.query(collision_coords, k=1)
 collisions_utm['distance_to_camera_m'] = distances
 
+buffer_radius = 500  # meters
+collisions_utm['within_camera_zone'] = within_radius(tree, collision_coords, buffer_radius, dist_m=distances)
+
+# DBSCAN clustering
+coords = np.array(list(zip(collisions_utm.geometry.x, collisions_utm.geometry.y)))
+# eps=300m, min 5 collisions: DBSCAN labels from a sparse radius-neighbour graph
+collisions_utm['cluster'] = hotspot_labels(coords, eps=300, min_samples=5)
+
 # convert back to lat/lon for mapping
 collisions_map = collisions_utm.to_crs(epsg=4326)
 cameras_map = cameras_utm.to_crs(epsg=4326)
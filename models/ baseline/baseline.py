@@ -15,13 +15,19 @@ import numpy as np
 from scipy import stats
 import seaborn as sns
 import matplotlib.pyplot as plt
-from sklearn.cluster import KMeans, DBSCAN
+from sklearn.cluster import KMeans
 import geopandas as gpd
 from scipy.spatial import cKDTree
 import folium
 from folium.plugins import MarkerCluster
 import matplotlib.cm as cm
 import matplotlib.colors as colors
+import sys
+
+sys.path.append("../../data/preprocessing")  # shared spatial helpers
+sys.path.append("../../methods/spatial_clustering")
+from hotspots import hotspot_labels
+from spatial_index import within_radius
 
 collisions = pd.read_csv("/content/drive/My Drive/MIE368 Project - Group 15/Code/collisions_dataset/collisions_dataset_new/collisions_enriched.csv")
 speed_cameras = pd.read_csv("/content/drive/My Drive/MIE368 Project - Group 15/Code/speed_camera_dataset/speed_camera_clean_new/speed_cameras_clean.csv")
@@ -49,12 +55,9 @@ tree = cKDTree(camera_coords)
 distances, _ = tree.query(collision_coords, k=1)
 coll_utm['distance_to_camera_m'] = distances
 
-# 500m buffer coverage
+# 500m coverage: within the radius of any camera, read off the nearest-camera distances
 buffer_radius = 500
-cam_utm['buffer'] = cam_utm.geometry.buffer(buffer_radius)
-all_buffers = cam_utm['buffer'].unary_union
-
-coll_utm['within_500m'] = coll_utm.geometry.within(all_buffers)
+coll_utm['within_500m'] = within_radius(tree, collision_coords, buffer_radius, dist_m=distances)
 
 coverage_rate = coll_utm['within_500m'].mean()
 avg_distance = coll_utm['distance_to_camera_m'].mean()
@@ -137,8 +140,8 @@ print(collisions['k_cluster'].value_counts(normalize=True))
 
 # DBSCAN Hotspot Clustering
 coords_utm = np.array(list(zip(coll_utm.geometry.x, coll_utm.geometry.y)))
-db = DBSCAN(eps=300, min_samples=5).fit(coords_utm)
-coll_utm['db_cluster'] = db.labels_
+# same labels as DBSCAN(eps=300, min_samples=5), from a sparse radius-neighbour graph
+coll_utm['db_cluster'] = hotspot_labels(coords_utm, eps=300, min_samples=5)
 
 print("\nDBSCAN Hotspots:")
 print(coll_utm['db_cluster'].value_counts())
@@ -0,0 +1,169 @@
+# models/ baseline/baseline_metrics.py
+import hashlib
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.spatial import cKDTree
+from sklearn.cluster import KMeans
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "data" / "preprocessing"))  # shared spatial helpers
+sys.path.append(str(Path(__file__).resolve().parents[2] / "methods" / "spatial_clustering"))
+from hotspots import hotspot_labels
+from spatial_index import project_utm, within_radius
+
+BUFFER_RADIUS = 500
+COLLISION_COLS = ["date", "hour", "lat", "lon", "x_utm", "y_utm", "severity", "wx_precip_amount_any", "wx_snow"]
+CAMERA_COLS = ["lat", "lon", "x_utm", "y_utm", "status_clean"]
+SEVERITY_NUM = {"Property Damage Only": 1, "Injury": 2, "Non-Fatal Injury": 2, "Fatal": 3}
+
+# the 11 rows of the notebook's "Baseline Summary" table
+METRIC_LABELS = {
+    "coverage_rate": "Coverage rate (500m)",
+    "avg_distance_m": "Avg distance to nearest camera (m)",
+    "precip_corr": "Precipitation correlation",
+    "snow_corr": "Snow correlation",
+    "ttest_p": "T-test p-value (Near vs Far severity)",
+    "chi2_p_severity_camera": "Chi-square p: severity vs camera",
+    "chi2_p_lighting_severity": "Chi-square p: lighting vs severity",
+    "anova_p_month": "ANOVA p-value (seasonal severity)",
+    "dbscan_hotspots": "DBSCAN hotspots",
+    "hotspots_outside": "Hotspots outside coverage",
+    "coverage_percent": "Baseline Coverage Percentage",
+}
+
+#utils -
+def load_inputs(collisions_path, cameras_path) -> tuple:
+    """
+    Read only the columns the baseline uses and attach UTM x/y once (persisted x_utm / y_utm
+    when present, else one vectorized projection). Rows without coordinates are dropped.
+    """
+    out = []
+    for path, cols in ((collisions_path, COLLISION_COLS), (cameras_path, CAMERA_COLS)):
+        df = pd.read_csv(path, usecols=lambda c: c in cols).dropna(subset=["lat", "lon"]).reset_index(drop=True)
+        if not {"x_utm", "y_utm"} <= set(df.columns):
+            df["x_utm"], df["y_utm"] = project_utm(df["lat"].to_numpy(), df["lon"].to_numpy())
+        out.append(df)
+    return tuple(out)
+
+def spatial_context(collisions: pd.DataFrame, cameras: pd.DataFrame, radius: float = BUFFER_RADIUS) -> dict:
+    """The one camera KD-tree query every spatial metric shares: distance and within-radius flag."""
+    coll_xy = collisions[["x_utm", "y_utm"]].to_numpy(dtype=float)
+    tree = cKDTree(cameras[["x_utm", "y_utm"]].to_numpy(dtype=float))
+    dist, _ = tree.query(coll_xy, k=1)
+    return {"xy": coll_xy, "dist": dist, "within": within_radius(tree, coll_xy, radius, dist_m=dist)}
+
+def coverage_metrics(ctx: dict) -> dict:
+    rate = float(ctx["within"].mean())
+    return {"coverage_rate": rate, "avg_distance_m": float(ctx["dist"].mean()), "coverage_percent": 100.0 * rate}
+
+def weather_metrics(collisions: pd.DataFrame) -> dict:
+    daily = (collisions.groupby("date")
+             .agg(collision_count=("severity", "count"), precip=("wx_precip_amount_any", "mean"),
+                  snow=("wx_snow", "mean"))
+             .dropna())
+    return {"precip_corr": float(stats.pearsonr(daily["precip"], daily["collision_count"])[0]),
+            "snow_corr": float(stats.pearsonr(daily["snow"], daily["collision_count"])[0])}
+
+def severity_tests(collisions: pd.DataFrame, within: np.ndarray) -> dict:
+    """T-test / chi-square / ANOVA of the notebook (same samples, random_state=42)."""
+    df = pd.DataFrame({
+        "severity": collisions["severity"].to_numpy(),
+        "severity_num": collisions["severity"].map(SEVERITY_NUM).to_numpy(),
+        "near_far": np.where(within, "Near", "Far"),
+        "day_night": np.where((collisions["hour"] >= 7) & (collisions["hour"] <= 18), "Day", "Night"),
+        "month": pd.to_datetime(collisions["date"], errors="coerce").dt.month.to_numpy(),
+    })
+    near = df.loc[df["near_far"] == "Near", "severity_num"]
+    far = df.loc[df["near_far"] == "Far", "severity_num"]
+    n = min(len(near), len(far), 10000)
+    t_p = stats.ttest_ind(near.sample(n, random_state=42), far.sample(n, random_state=42), equal_var=False)[1]
+    groups = [g["severity_num"].sample(min(len(g), 10000), random_state=42)
+              for _, g in df.groupby("month") if g["severity_num"].nunique() > 1]
+    return {
+        "ttest_p": float(t_p),
+        "chi2_p_severity_camera": float(stats.chi2_contingency(pd.crosstab(df["severity"], df["near_far"]))[1]),
+        "chi2_p_lighting_severity": float(stats.chi2_contingency(pd.crosstab(df["day_night"], df["severity"]))[1]),
+        "anova_p_month": float(stats.f_oneway(*groups)[1]),
+    }
+
+def kmeans_metrics(collisions: pd.DataFrame, n_clusters: int = 4) -> dict:
+    labels = KMeans(n_clusters=n_clusters, n_init=10, random_state=42).fit_predict(collisions[["lon", "lat"]])
+    share = np.bincount(labels, minlength=n_clusters) / labels.size
+    return {"kmeans_cluster_share": [float(s) for s in share]}
+
+def dbscan_metrics(ctx: dict, eps: float = 300, min_samples: int = 5) -> dict:
+    labels = hotspot_labels(ctx["xy"], eps=eps, min_samples=min_samples)
+    hot = labels != -1
+    return {"dbscan_hotspots": int(hot.sum()), "hotspots_outside": int((hot & ~ctx["within"]).sum()),
+            "dbscan_clusters": int(labels.max() + 1)}
+
+def camera_hash(cameras: pd.DataFrame) -> str:
+    """Content hash of the camera list (sorted coordinates), to tell refreshes apart."""
+    xy = np.round(cameras[["x_utm", "y_utm"]].to_numpy(dtype=float), 1)
+    xy = xy[np.lexsort(xy.T[::-1])]
+    return hashlib.sha1(xy.tobytes()).hexdigest()
+
+def compute_baseline(collisions: pd.DataFrame, cameras: pd.DataFrame, radius: float = BUFFER_RADIUS,
+                     parallel: bool = False) -> dict:
+    """
+    Every baseline metric from one load and one camera KD-tree query. The metric groups only
+    read the shared inputs, so parallel=True runs them in a thread pool (most of their time
+    is spent in compiled numpy / scipy / sklearn code).
+    Returns a JSON-ready record: {"inputs": ..., "metrics": ...} (see diff_baselines).
+    """
+    ctx = spatial_context(collisions, cameras, radius)
+    tasks = [
+        (coverage_metrics, (ctx,)),
+        (weather_metrics, (collisions,)),
+        (severity_tests, (collisions, ctx["within"])),
+        (kmeans_metrics, (collisions,)),
+        (dbscan_metrics, (ctx,)),
+    ]
+    if parallel:
+        with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+            parts = list(pool.map(lambda t: t[0](*t[1]), tasks))
+    else:
+        parts = [f(*args) for f, args in tasks]
+
+    metrics = {}
+    for part in parts:
+        metrics.update(part)
+    return {
+        "inputs": {"n_collisions": int(len(collisions)), "n_cameras": int(len(cameras)),
+                   "camera_hash": camera_hash(cameras), "radius_m": radius, "computed_at": time.time()},
+        "metrics": metrics,
+    }
+
+def summary_table(record: dict) -> pd.DataFrame:
+    """The notebook's Metric / Value summary table from a baseline record."""
+    m = record["metrics"]
+    return pd.DataFrame({"Metric": list(METRIC_LABELS.values()), "Value": [m[k] for k in METRIC_LABELS]})
+
+def diff_baselines(old: dict, new: dict) -> pd.DataFrame:
+    """Scalar metrics of two baseline records side by side (e.g. before / after a camera refresh)."""
+    keys = [k for k in new["metrics"] if np.isscalar(new["metrics"][k])]
+    old_v = np.array([old["metrics"].get(k, np.nan) for k in keys], dtype=float)
+    new_v = np.array([new["metrics"][k] for k in keys], dtype=float)
+    return pd.DataFrame({"metric": keys, "old": old_v, "new": new_v, "change": new_v - old_v})
+
+def save_record(record: dict, path):
+    with open(path, "w") as fh:
+        json.dump(record, fh, indent=1)
+
+def load_record(path) -> dict:
+    with open(path) as fh:
+        return json.load(fh)
+
+if __name__ == "__main__":
+    # python baseline_metrics.py collisions_enriched.csv speed_cameras_clean.csv baseline.json [previous.json]
+    collisions, cameras = load_inputs(sys.argv[1], sys.argv[2])
+    record = compute_baseline(collisions, cameras, parallel=True)
+    save_record(record, sys.argv[3])
+    print(summary_table(record).to_string(index=False))
+    if len(sys.argv) > 4:
+        print(diff_baselines(load_record(sys.argv[4]), record).to_string(index=False))
@@ -0,0 +1,87 @@
+# models/optimization/bounds.py
+import numpy as np
+import pulp as pl
+from scipy import sparse
+
+from greedy import greedy_sites
+from model_builder import build_max_coverage_model, coverage_summary
+
+#utils -
+def lagrangian_bound(A: sparse.csr_matrix, weights, K: int, lower: float = None, iters: int = 200,
+                     theta: float = 2.0, tol: float = 1e-4) -> dict:
+    """
+    Upper bound on the max-coverage optimum from the Lagrangian relaxation of the Coverage_i
+    rows (multipliers u_i >= 0), with Camera_Budget kept:
+
+        L(u) = sum_i max(0, w_i - u_i) + (sum of the K largest (A.T u)_j)
+
+    Any u gives a valid bound; subgradient steps g = A x(u) - y(u) with the Polyak step
+    theta * (L - lower) / |g|^2 tighten it, theta halved after 20 steps without progress.
+    (Relaxing Camera_Budget instead would leave an uncapacitated covering problem that is
+    as hard as the original.) Each step is two sparse products.
+    Returns {"bound", "u", "site_mask" of the last x(u), "iters"}.
+    """
+    A = sparse.csr_matrix(A).astype(np.float64)
+    At = A.T.tocsr()
+    w = np.asarray(weights, dtype=float)
+    if lower is None:
+        lower = coverage_summary(A, w, greedy_sites(A, w, K))["covered_weight"]
+    K = min(K, A.shape[1])
+
+    u = 0.5 * w
+    best, best_u, best_x, stall = np.inf, u, np.zeros(A.shape[1], dtype=bool), 0
+    for it in range(1, iters + 1):
+        c = At @ u
+        top = np.argpartition(-c, K - 1)[:K] if K > 0 else np.zeros(0, dtype=np.int64)
+        top = top[c[top] > 0]
+        x = np.zeros(A.shape[1]); x[top] = 1.0
+        y = (w > u).astype(float)
+        L = float(np.maximum(w - u, 0).sum() + c[top].sum())
+        if L < best - 1e-9:
+            best, best_u, best_x, stall = L, u, x > 0, 0
+        else:
+            stall += 1
+            if stall >= 20:
+                theta, stall = theta / 2, 0
+        g = A @ x - y
+        gg = float(g @ g)
+        if gg == 0 or best - lower <= tol * max(best, 1.0) or theta < 1e-6:
+            break
+        u = np.maximum(u - theta * (L - lower) / gg * g, 0.0)
+    return {"bound": best, "u": best_u, "site_mask": best_x, "iters": it}
+
+def lp_bound(A: sparse.csr_matrix, weights, K: int, time_limit: float = None) -> float:
+    """Objective of the LP relaxation of the coverage model (x_j, y_i in [0, 1]), solved by CBC."""
+    A = sparse.csr_matrix(A)
+    m, x, y = build_max_coverage_model(A, weights, K, range(A.shape[1]), range(A.shape[0]),
+                                       name="Camera_Placement_LP")
+    for v in m.variables():
+        v.cat = pl.LpContinuous
+    m.solve(pl.PULP_CBC_CMD(msg=False, timeLimit=time_limit))
+    return float(pl.value(m.objective) or 0.0)
+
+def optimality_gap(A: sparse.csr_matrix, weights, K: int, site_mask=None, method: str = "lagrangian",
+                   **kwargs) -> dict:
+    """
+    How far a plan (default: the greedy plan) can be from optimal: covered weight of the plan,
+    an upper bound (method "lagrangian", "lp" or "both" -> the tighter of the two) and
+    gap_percent = 100 * (bound - covered) / bound.
+    """
+    w = np.asarray(weights, dtype=float)
+    if site_mask is None:
+        site_mask = greedy_sites(A, w, K)
+    covered = coverage_summary(A, w, site_mask)["covered_weight"]
+    bounds = {}
+    if method in ("lagrangian", "both"):
+        bounds["lagrangian_bound"] = lagrangian_bound(A, w, K, lower=covered, **kwargs)["bound"]
+    if method in ("lp", "both"):
+        bounds["lp_bound"] = lp_bound(A, w, K)
+    if not bounds:
+        raise ValueError(f"unknown method {method!r}")
+    bound = max(min(bounds.values()), covered)
+    return {
+        "covered_weight": covered,
+        **bounds,
+        "upper_bound": bound,
+        "gap_percent": 100.0 * (bound - covered) / bound if bound > 0 else 0.0,
+    }
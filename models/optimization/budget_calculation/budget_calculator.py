@@ -7,80 +7,89 @@ Original file is located at
     https://colab.research.google.com/drive/14NGebuMcLe-pNxs5YbqGB-_6idgq2OPu
 """
 
+import glob
+import sys
+from pathlib import Path
+import numpy as np
 import pandas as pd
-from pyproj import Transformer
+from scipy.optimize import linear_sum_assignment
+from scipy.spatial import cKDTree
+
+sys.path.append(str(Path(__file__).resolve().parents[3] / "data" / "preprocessing"))  # shared spatial helpers
+from spatial_index import UTM_EPSG, get_transformer
+
+MATCH_TOL_M = 250  # half a 500 m grid cell: an old camera this close to a new site is the same location
 
 def budget(comparison_result, non_repeated_multiplier=10000, repeated_multiplier=0, new_multiplier=50000): # $10k for moving cameras, $50k for new cameras
 
-    reinstall = comparison_result["active_old_locations_count"] * non_repeated_multiplier
-    no_reinstall = comparison_result["repeated_locations_count"] * repeated_multiplier
-    new = (comparison_summary["new_locations_count"] - comparison_summary["active_old_locations_count"]) * new_multiplier
+    counts = plan_counts(comparison_result["active_old_locations_count"],
+                         comparison_result["new_locations_count"],
+                         comparison_result["repeated_locations_count"])
+    reinstall = counts["moved"] * non_repeated_multiplier
+    no_reinstall = counts["kept"] * repeated_multiplier
+    new = counts["built"] * new_multiplier
 
     total_cost = reinstall + no_reinstall + new
     return total_cost
 
-def compare_camera_locations(oldlocations,
-                             newlocations,
-                             old_lat_col='lat',
-                             old_lon_col='lon',
-                             new_x_col='x_coord',
-                             new_y_col='y_coord',
-                             xy_epsg="EPSG:3857",
-                             precision=6):
-
-    df_old = pd.read_csv(oldlocations)
-    df_new = pd.read_csv(newlocations)
-
-    # filter active cameras
+def plan_counts(n_old, n_new, n_repeated) -> dict:
+    """
+    Keep / move / build counts (scalars or arrays over plans), same rules as relocation.py:
+    matched sites keep their camera, the other new sites first take freed old cameras,
+    any remaining site needs a new camera.
+    """
+    n_old, n_new, kept = np.asarray(n_old), np.asarray(n_new), np.asarray(n_repeated)
+    moved = np.minimum(n_new - kept, n_old - kept)
+    return {"kept": kept, "moved": moved, "built": n_new - kept - moved, "removed": n_old - kept - moved}
+
+def _read(locations) -> pd.DataFrame:
+    return locations.copy() if isinstance(locations, pd.DataFrame) else pd.read_csv(locations)
+
+def active_cameras(oldlocations) -> pd.DataFrame:
+    """Existing cameras (csv path or frame), active ones only when status_clean is present."""
+    df_old = _read(oldlocations)
     if "status_clean" in df_old.columns:
         df_old = df_old[df_old["status_clean"].str.lower() == "active"]
-
-    # convert to lat/long
-    transformer = Transformer.from_crs(xy_epsg, "EPSG:4326", always_xy=True)
-    df_new['lon'], df_new['lat'] = transformer.transform(df_new[new_x_col],
-                                                         df_new[new_y_col])
-
-    df_old['lat_r'] = df_old[old_lat_col].round(precision)
-    df_old['lon_r'] = df_old[old_lon_col].round(precision)
-    df_new['lat_r'] = df_new['lat'].round(precision)
-    df_new['lon_r'] = df_new['lon'].round(precision)
-
-    old_set = set(zip(df_old['lat_r'], df_old['lon_r']))
-    new_set = set(zip(df_new['lat_r'], df_new['lon_r']))
-
-    # compare coords
-    same = old_set & new_set
-    only_old = old_set - new_set
-    only_new = new_set - old_set
-
-    non_repeated_count = len(only_old) + len(only_new)
-    repeated_count = len(same)
-
-    return {
-        "active_old_locations_count": len(df_old) + 1,
-        "new_locations_count": len(df_new),
-        "repeated_locations_count": repeated_count,
-        "non_repeated_locations_count": non_repeated_count
-    }
-
-if __name__ == "__main__":
-    comparison_summary = compare_camera_locations(
-        "speed_cameras_clean (2).csv",
-        "optimal_camera_sites_K150.csv",
-        new_x_col="x_coord",
-        new_y_col="y_coord",
-        xy_epsg="EPSG:3857"
-    )
-
-    cost = budget(comparison_summary)
-
-    print("Total Current Active Cameras:", comparison_summary["active_old_locations_count"])
-    print("Total New Cameras:", comparison_summary["new_locations_count"])
-    print("Repeated Locations:", comparison_summary["repeated_locations_count"])
-    print("")
-    print("Old Cameras to be Reinstalled:", comparison_summary["active_old_locations_count"])
-    print("New Cameras to be Built:", comparison_summary["new_locations_count"] - comparison_summary["active_old_locations_count"])
-    print("Final Cost for New Plan: $", cost)
+    return df_old
+
+def old_xy(df_old, lat_col='lat', lon_col='lon') -> np.ndarray:
+    """Existing cameras in UTM 17N meters (cached lat/lon -> UTM transformer)."""
+    x, y = get_transformer("EPSG:4326", UTM_EPSG).transform(df_old[lon_col].to_numpy(dtype=float),
+                                                             df_old[lat_col].to_numpy(dtype=float))
+    return np.column_stack([x, y])
+
+def new_xy(df_new, x_col='x_coord', y_col='y_coord', xy_epsg=UTM_EPSG) -> np.ndarray:
+    """Optimized sites in UTM 17N meters; already UTM (the optimizer grid) unless xy_epsg says otherwise."""
+    x, y = df_new[x_col].to_numpy(dtype=float), df_new[y_col].to_numpy(dtype=float)
+    if xy_epsg != UTM_EPSG:
+        x, y = get_transformer(xy_epsg, UTM_EPSG).transform(x, y)
+    return np.column_stack([x, y])
+
+def match_cameras(old_pts, new_pts, tol_m=MATCH_TOL_M, old_tree=None):
+    """
+    One-to-one matching of old cameras to new sites within tol_m meters: candidate pairs come
+    from a KD-tree distance query, then an assignment over the cameras that have any candidate
+    maximizes the number of matches (ties -> smallest total distance).
+    Returns (old_idx, new_idx, dist_m) of the matched pairs.
+    """
+    old_pts, new_pts = np.asarray(old_pts, dtype=float), np.asarray(new_pts, dtype=float)
+    empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0))
+    if old_pts.shape[0] == 0 or new_pts.shape[0] == 0:
+        return empty
+    old_tree = old_tree if old_tree is not None else cKDTree(old_pts)
+    pairs = old_tree.sparse_distance_matrix(cKDTree(new_pts), tol_m, output_type="ndarray")
+    if pairs.size == 0:
+        return empty
+
+    rows, i = np.unique(pairs["i"], return_inverse=True)
+    cols, j = np.unique(pairs["j"], return_inverse=True)
+    big = tol_m * (rows.size + cols.size + 1) + 1.0  # any extra match beats any distance saving
+    cost = np.full((rows.size, cols.size), 2 * big)
+    cost[i, j] = pairs["v"] - big
+    r, c = linear_sum_assignment(cost)
+    hit = cost[r, c] < 0
+    r, c = r[hit], c[hit]
+    return rows[r], cols[c], cost[r, c] + big
 
 def compare_camera_locations(oldlocations,
                              newlocations,
@@ -88,59 +97,92 @@ def compare_camera_locations(oldlocations,
                              old_lon_col='lon',
                              new_x_col='x_coord',
                              new_y_col='y_coord',
-                             xy_epsg="EPSG:3857",
-                             precision=6):
-
-    df_old = pd.read_csv(oldlocations)
-    df_new = pd.read_csv(newlocations)
-
-    # filter active cameras
-    if "status_clean" in df_old.columns:
-        df_old = df_old[df_old["status_clean"].str.lower() == "active"]
-
-    # convert to lat/long
-    transformer = Transformer.from_crs(xy_epsg, "EPSG:4326", always_xy=True)
-    df_new['lon'], df_new['lat'] = transformer.transform(df_new[new_x_col],
-                                                         df_new[new_y_col])
-
-    df_old['lat_r'] = df_old[old_lat_col].round(precision)
-    df_old['lon_r'] = df_old[old_lon_col].round(precision)
-    df_new['lat_r'] = df_new['lat'].round(precision)
-    df_new['lon_r'] = df_new['lon'].round(precision)
-
-    old_set = set(zip(df_old['lat_r'], df_old['lon_r']))
-    new_set = set(zip(df_new['lat_r'], df_new['lon_r']))
-
-    # compare coords
-    same = old_set & new_set
-    only_old = old_set - new_set
-    only_new = new_set - old_set
-
-    non_repeated_count = len(only_old) + len(only_new)
-    repeated_count = len(same)
-
-    return {
-        "active_old_locations_count": len(df_old) + 1,
-        "new_locations_count": len(df_new),
-        "repeated_locations_count": repeated_count,
-        "non_repeated_locations_count": non_repeated_count
-    }
+                             xy_epsg=UTM_EPSG,
+                             tol_m=MATCH_TOL_M):
+    """
+    Compare the active cameras with one new plan (csv path or frame) or several at once
+    (list -> list of results, dict -> dict). A new site and an old camera are the same
+    location when they are paired by match_cameras within tol_m meters; the old cameras are
+    read, projected and indexed once for all plans.
+    """
+    df_old = active_cameras(oldlocations)
+    pts_old = old_xy(df_old, old_lat_col, old_lon_col)
+    tree = cKDTree(pts_old) if pts_old.shape[0] else None
+
+    def one(newloc):
+        df_new = _read(newloc)
+        old_idx, _, dist = match_cameras(pts_old, new_xy(df_new, new_x_col, new_y_col, xy_epsg), tol_m, tree)
+        repeated_count = old_idx.size
+        return {
+            "active_old_locations_count": len(df_old),
+            "new_locations_count": len(df_new),
+            "repeated_locations_count": repeated_count,
+            "non_repeated_locations_count": (len(df_old) - repeated_count) + (len(df_new) - repeated_count),
+            "mean_match_distance_m": float(dist.mean()) if dist.size else float("nan"),
+        }
+
+    if isinstance(newlocations, dict):
+        return {k: one(v) for k, v in newlocations.items()}
+    if isinstance(newlocations, (list, tuple)):
+        return [one(v) for v in newlocations]
+    return one(newlocations)
+
+def plan_files(plans) -> list:
+    """Plan csvs from a directory (every optimal_camera_sites_K*_R*.csv in it), a glob pattern or a list."""
+    if isinstance(plans, (str, Path)) and Path(plans).is_dir():
+        return sorted(Path(plans).glob("optimal_camera_sites_K*_R*.csv"))
+    if isinstance(plans, str):
+        return sorted(Path(p) for p in glob.glob(plans))
+    return [Path(p) for p in plans]
+
+def budget_report(oldlocations, plans, move_costs=(10000,), new_costs=(50000,), keep_cost=0,
+                  results=None, tol_m=MATCH_TOL_M, xy_epsg=UTM_EPSG) -> pd.DataFrame:
+    """
+    Cost table for many plans in one call: existing cameras are loaded and indexed once, every
+    plan is matched against them (compare_camera_locations), and the keep / move / build counts
+    are priced for every (move_cost, new_cost) pair by broadcasting, one row per plan x unit cost.
+    results (sensitivity_results.csv or frame with scenario / coverage columns) adds the coverage
+    of each plan, so the table is directly the cost-vs-coverage frontier.
+    """
+    files = plan_files(plans)
+    names = [f.stem.replace("optimal_camera_sites_", "") for f in files]
+    comp = compare_camera_locations(oldlocations, dict(zip(names, files)), tol_m=tol_m, xy_epsg=xy_epsg)
+    n_old = np.array([comp[n]["active_old_locations_count"] for n in names])
+    n_new = np.array([comp[n]["new_locations_count"] for n in names])
+    counts = plan_counts(n_old, n_new, [comp[n]["repeated_locations_count"] for n in names])
+
+    mc, nc = np.meshgrid(np.asarray(move_costs, dtype=float), np.asarray(new_costs, dtype=float), indexing="ij")
+    mc, nc = mc.ravel(), nc.ravel()
+    cost = (counts["moved"][:, None] * mc + counts["built"][:, None] * nc
+            + counts["kept"][:, None] * keep_cost)  # plans x unit-cost pairs
+
+    n_cost = mc.size
+    scen = pd.Series(names).str.extract(r"K(?P<K>\d+)_R(?P<RADIUS>\d+)").astype("Int64")
+    report = pd.DataFrame({
+        "scenario": np.repeat(names, n_cost),
+        "K": np.repeat(scen["K"].to_numpy(), n_cost),
+        "RADIUS": np.repeat(scen["RADIUS"].to_numpy(), n_cost),
+        "n_cameras": np.repeat(n_new, n_cost),
+        "kept": np.repeat(counts["kept"], n_cost),
+        "moved": np.repeat(counts["moved"], n_cost),
+        "built": np.repeat(counts["built"], n_cost),
+        "removed": np.repeat(counts["removed"], n_cost),
+        "move_cost": np.tile(mc, len(names)),
+        "new_cost": np.tile(nc, len(names)),
+        "total_cost": cost.ravel(),
+    })
+    if results is not None:
+        res = results if isinstance(results, pd.DataFrame) else pd.read_csv(results)
+        cov = [c for c in ("coverage_cells_percent", "coverage_risk_percent") if c in res.columns]
+        report = report.merge(res[["scenario"] + cov], on="scenario", how="left")
+    return report
 
 if __name__ == "__main__":
-    comparison_summary = compare_camera_locations(
-        "speed_cameras_clean (2).csv",
-        "optimal_camera_sites_K250_R500.csv",
-        new_x_col="x_coord",
-        new_y_col="y_coord",
-        xy_epsg="EPSG:3857"
-    )
-
-    cost = budget(comparison_summary)
-
-    print("Total Current Active Cameras:", comparison_summary["active_old_locations_count"])
-    print("Total New Cameras:", comparison_summary["new_locations_count"])
-    print("Repeated Locations:", comparison_summary["repeated_locations_count"])
-    print("")
-    print("Old Cameras to be Reinstalled:", comparison_summary["active_old_locations_count"])
-    print("New Cameras to be Built:", comparison_summary["new_locations_count"] - comparison_summary["active_old_locations_count"])
-    print("Final Cost for New Plan: $", cost)
\ No newline at end of file
+    here = Path(__file__).resolve().parent
+    report = budget_report(here.parent / "final_optimization" / "speed_cameras_clean.csv",
+                           here.parent / "sensitivity_analysis",
+                           results=here.parent / "sensitivity_analysis" / "sensitivity_results.csv")
+
+    for row in report.itertuples():
+        print(f"[{row.scenario}] keep {row.kept}, move {row.moved}, build {row.built}: "
+              f"${row.total_cost:,.0f} for {row.coverage_risk_percent:.2f}% risk covered")
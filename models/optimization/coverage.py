@@ -0,0 +1,82 @@
+# models/optimization/coverage.py
+import hashlib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.spatial import cKDTree
+
+# (demand hash, site hash, radius) -> CSR coverage matrix, shared by every scenario in a session
+_COVERAGE_CACHE = {}
+
+#utils -
+def array_key(a) -> str:
+    """Content hash of a coordinate array (shape + float64 bytes)."""
+    a = np.ascontiguousarray(a, dtype=float)
+    h = hashlib.sha1(str(a.shape).encode())
+    h.update(a.tobytes())
+    return h.hexdigest()
+
+def xy(df: pd.DataFrame, x_col: str = "x_coord", y_col: str = "y_coord") -> np.ndarray:
+    return df[[x_col, y_col]].to_numpy(dtype=float)
+
+def build_coverage_matrix(demand_xy, site_xy, radius: float, cache: bool = True) -> sparse.csr_matrix:
+    """
+    Sparse a_ij: row i = demand point, column j = candidate site, 1 if dist(i, j) <= radius.
+    One KD-tree ball query over the sites instead of the I x J Python double loop.
+    Cached per (demand coords, site coords, radius).
+    """
+    demand_xy = np.asarray(demand_xy, dtype=float)
+    site_xy = np.asarray(site_xy, dtype=float)
+    key = (array_key(demand_xy), array_key(site_xy), float(radius))
+    if cache and key in _COVERAGE_CACHE:
+        return _COVERAGE_CACHE[key]
+
+    n_i, n_j = demand_xy.shape[0], site_xy.shape[0]
+    if n_i == 0 or n_j == 0:
+        A = sparse.csr_matrix((n_i, n_j), dtype=np.int8)
+    else:
+        hits = cKDTree(site_xy).query_ball_point(demand_xy, r=radius, return_sorted=True)
+        lengths = np.fromiter((len(h) for h in hits), dtype=np.int64, count=n_i)
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+        indices = np.concatenate(hits).astype(np.int64) if indptr[-1] else np.zeros(0, dtype=np.int64)
+        A = sparse.csr_matrix((np.ones(indices.size, dtype=np.int8), indices, indptr), shape=(n_i, n_j))
+
+    if cache:
+        _COVERAGE_CACHE[key] = A
+    return A
+
+def coverage_pairs(A: sparse.csr_matrix, demand_ids, site_ids) -> pd.DataFrame:
+    """Long (demand_id, site_id) table of the nonzeros, same layout as the old coverage_df."""
+    coo = A.tocoo()
+    return pd.DataFrame({
+        "demand_id": np.asarray(demand_ids)[coo.row],
+        "site_id": np.asarray(site_ids)[coo.col],
+    })
+
+def merge_identical_rows(A: sparse.csr_matrix, weights) -> tuple:
+    """
+    Collapse demand rows that are covered by exactly the same sites (summing their weights) and
+    drop rows no site covers. With point-level demand most nearby points share a site set, so
+    the MIP gets one Coverage row per distinct set instead of one per point.
+    Returns (A_merged, merged_weights, row_map) where row_map[i] is the merged row of demand
+    row i (-1 if uncovered).
+    """
+    A = sparse.csr_matrix(A)
+    A.sort_indices()
+    w = np.asarray(weights, dtype=float)
+    lengths = np.diff(A.indptr)
+    row_map = np.full(A.shape[0], -1, dtype=np.int64)
+    groups = {}
+    for i in np.flatnonzero(lengths > 0):
+        key = A.indices[A.indptr[i]:A.indptr[i + 1]].tobytes()
+        row_map[i] = groups.setdefault(key, len(groups))
+
+    n = len(groups)
+    first = np.full(n, -1, dtype=np.int64)
+    hit = np.flatnonzero(row_map >= 0)
+    first[row_map[hit[::-1]]] = hit[::-1]  # first demand row of each group
+    merged_w = np.bincount(row_map[hit], weights=w[hit], minlength=n)
+    return A[first], merged_w, row_map
+
+def clear_coverage_cache():
+    _COVERAGE_CACHE.clear()
@@ -0,0 +1,124 @@
+# models/optimization/demand_points.py
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from coverage import build_coverage_matrix, merge_identical_rows, xy
+from evaluate import camera_xy
+from greedy import greedy_sites
+from model_builder import build_max_coverage_model, chosen_mask, coverage_summary, solve
+
+LATTICE_M = 50          # demand lattice spacing (25-50 m keeps the snap error under ~35 m)
+SEVERITY_WEIGHTS = {    # same scale as severity_num in statistical_tests.py
+    "Property Damage Only": 1.0,
+    "Injury": 2.0,
+    "Non-Fatal Injury": 2.0,
+    "Fatal": 3.0,
+}
+
+#utils -
+def collision_weights(collisions: pd.DataFrame, severity_weights: dict = None) -> np.ndarray:
+    """Per-collision demand weight from the severity column (1.0 if missing / unmapped)."""
+    if severity_weights is None:
+        severity_weights = SEVERITY_WEIGHTS
+    if "severity" not in collisions.columns:
+        return np.ones(len(collisions))
+    return collisions["severity"].map(severity_weights).fillna(1.0).to_numpy(dtype=float)
+
+def valid_points(collisions: pd.DataFrame, severity_weights: dict = None, return_mask: bool = False):
+    """Planar collision coordinates with finite x/y and their severity weights (and the row mask)."""
+    pts = camera_xy(collisions)
+    w = collision_weights(collisions, severity_weights)
+    ok = np.isfinite(pts).all(axis=1)
+    return (pts[ok], w[ok], ok) if return_mask else (pts[ok], w[ok])
+
+def lattice_index(pts: np.ndarray, lattice_m: float = LATTICE_M):
+    """Occupied lattice cells (integer keys, sorted) and the cell of every point."""
+    keys, inv = np.unique(np.floor(pts / lattice_m).astype(np.int64), axis=0, return_inverse=True)
+    return keys, inv.ravel()
+
+def aggregate_demand(collisions: pd.DataFrame, lattice_m: float = LATTICE_M,
+                     severity_weights: dict = None) -> pd.DataFrame:
+    """
+    Snap every collision (x_utm / y_utm, or lon / lat) to the centre of a lattice_m square and
+    merge duplicates: one demand point per occupied lattice cell with the summed severity
+    weight. Returns demand_id, x_coord, y_coord, n_collisions, weight.
+    """
+    pts, w = valid_points(collisions, severity_weights)
+    keys, inv = lattice_index(pts, lattice_m)
+    return pd.DataFrame({
+        "demand_id": np.arange(keys.shape[0]),
+        "x_coord": (keys[:, 0] + 0.5) * lattice_m,
+        "y_coord": (keys[:, 1] + 0.5) * lattice_m,
+        "n_collisions": np.bincount(inv, minlength=keys.shape[0]),
+        "weight": np.bincount(inv, weights=w, minlength=keys.shape[0]),
+    })
+
+def candidate_sites(collisions: pd.DataFrame, top_n: int = 1500, min_spacing_m: float = LATTICE_M,
+                    severity_weights: dict = None) -> pd.DataFrame:
+    """
+    Candidate camera sites at real collision locations: distinct collision coordinates (to the
+    metre, so repeat collisions at one intersection merge) ranked by summed severity weight,
+    thinned so no two candidates are closer than min_spacing_m, top_n kept.
+    Returns site_id, x_coord, y_coord, weight.
+    """
+    pts, w = valid_points(collisions, severity_weights)
+    loc, inv = np.unique(np.round(pts), axis=0, return_inverse=True)
+    loc_w = np.bincount(inv.ravel(), weights=w, minlength=loc.shape[0])
+    order = np.argsort(-loc_w, kind="stable")
+
+    if min_spacing_m and min_spacing_m > 0:
+        tree = cKDTree(loc)
+        blocked = np.zeros(loc.shape[0], dtype=bool)
+        picked = []
+        for j in order:
+            if blocked[j]:
+                continue
+            picked.append(j)
+            if len(picked) == top_n:
+                break
+            blocked[tree.query_ball_point(loc[j], r=min_spacing_m)] = True
+        picked = np.array(picked, dtype=np.int64)
+    else:
+        picked = order[:top_n]
+
+    return pd.DataFrame({
+        "site_id": np.arange(picked.size),
+        "x_coord": loc[picked, 0],
+        "y_coord": loc[picked, 1],
+        "weight": loc_w[picked],
+    })
+
+def optimize_point_demand(collisions: pd.DataFrame, K: int, radius: float, lattice_m: float = LATTICE_M,
+                          top_n: int = 1500, solver: str = "cbc", time_limit: float = None,
+                          severity_weights: dict = None) -> tuple:
+    """
+    Max coverage on lattice demand points with candidates at real collision locations.
+    Demand rows with the same covering-site set are merged before the MIP (merge_identical_rows),
+    and CBC is warm-started from the greedy plan; coverage is reported over all demand points.
+    Returns (summary dict, chosen-sites frame).
+    """
+    demand = aggregate_demand(collisions, lattice_m, severity_weights)
+    sites = candidate_sites(collisions, top_n=top_n, min_spacing_m=lattice_m,
+                            severity_weights=severity_weights)
+    w = demand["weight"].to_numpy()
+    A = build_coverage_matrix(xy(demand), xy(sites), radius)
+    A_m, w_m, _ = merge_identical_rows(A, w)
+
+    start = greedy_sites(A_m, w_m, K)
+    if solver == "greedy":
+        mask, status = start, "greedy"
+    else:
+        site_ids = sites["site_id"].to_numpy()
+        m, x, y = build_max_coverage_model(A_m, w_m, K, site_ids, np.arange(A_m.shape[0]),
+                                           name="Camera_Placement_PointDemand")
+        for j, chosen in zip(site_ids, start):
+            x[j].setInitialValue(1 if chosen else 0)
+        status = solve(m, time_limit=time_limit, warm_start=True)
+        mask = chosen_mask(x, site_ids)
+
+    summary = coverage_summary(A, w, mask)
+    summary.pop("covered")
+    summary.update({"status": status, "K": K, "RADIUS": radius, "lattice_m": lattice_m,
+                    "demand_points": A.shape[0], "model_rows": A_m.shape[0], "candidates": A.shape[1]})
+    return summary, sites[mask].reset_index(drop=True)
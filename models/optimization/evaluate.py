@@ -0,0 +1,108 @@
+# models/optimization/evaluate.py
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "data" / "preprocessing"))  # shared spatial helpers
+from spatial_index import project_utm
+from coverage import build_coverage_matrix
+
+PLAN_COLS = ["plan", "n_cameras", "covered_cells", "total_cells", "coverage_cells_percent",
+             "covered_weight", "total_weight", "coverage_risk_percent"]
+
+#utils -
+def camera_xy(df: pd.DataFrame) -> np.ndarray:
+    """
+    Planar coordinates (UTM 17N, same frame as the grid x_coord / y_coord) of a camera layout:
+    x_coord / y_coord (optimizer output), x_utm / y_utm (cleaned camera file) or lon / lat.
+    """
+    for x_col, y_col in (("x_coord", "y_coord"), ("x_utm", "y_utm")):
+        if {x_col, y_col} <= set(df.columns):
+            return df[[x_col, y_col]].to_numpy(dtype=float)
+    x, y = project_utm(df["lat"].to_numpy(dtype=float), df["lon"].to_numpy(dtype=float))
+    return np.column_stack([x, y])
+
+def plan_matrix(plans, n_sites: int) -> sparse.csc_matrix:
+    """
+    Site x plan incidence matrix P (p_jk = 1 if site j is in plan k) from a list of
+    site-position arrays (or boolean masks over the sites).
+    """
+    cols = []
+    for p in plans:
+        p = np.asarray(p)
+        cols.append(np.flatnonzero(p) if p.dtype == bool else np.unique(p.astype(np.int64)))
+    indptr = np.concatenate([[0], np.cumsum([c.size for c in cols])])
+    indices = np.concatenate(cols) if indptr[-1] else np.zeros(0, dtype=np.int64)
+    return sparse.csc_matrix((np.ones(indices.size, dtype=np.int32), indices, indptr),
+                             shape=(n_sites, len(cols)))
+
+def evaluate_plans(A: sparse.csr_matrix, weights, P: sparse.spmatrix, names=None) -> pd.DataFrame:
+    """
+    Coverage of many plans at once: C = A @ P counts the cameras of plan k within range of
+    demand row i, so (C > 0) is the covered mask of every plan and w @ (C > 0) the covered
+    weights. Same numbers as model_builder.coverage_summary, one row per plan.
+    """
+    w = np.asarray(weights, dtype=float)
+    P = sparse.csc_matrix(P)
+    covered = (sparse.csr_matrix(A).astype(np.int32) @ P) > 0   # demand x plans, sparse bool
+    covered_cells = np.asarray(covered.sum(axis=0)).ravel()
+    covered_weight = covered.T.astype(float) @ w
+    total_cells, total_weight = w.shape[0], w.sum()
+    n_plans = P.shape[1]
+    return pd.DataFrame({
+        "plan": list(names) if names is not None else np.arange(n_plans),
+        "n_cameras": np.diff(P.indptr),
+        "covered_cells": covered_cells,
+        "total_cells": total_cells,
+        "coverage_cells_percent": 100.0 * covered_cells / total_cells if total_cells > 0 else np.zeros(n_plans),
+        "covered_weight": covered_weight,
+        "total_weight": total_weight,
+        "coverage_risk_percent": 100.0 * covered_weight / total_weight if total_weight > 0 else np.zeros(n_plans),
+    }, columns=PLAN_COLS)
+
+def evaluate_plans_multi(A: sparse.csr_matrix, W, P: sparse.spmatrix, names=None,
+                         scheme_names=None) -> pd.DataFrame:
+    """
+    evaluate_plans for a (demand x schemes) weight matrix: the covered mask of every plan is
+    computed once and (C > 0).T @ W scores all plans under all schemes in one product.
+    Returns one row per (plan, scheme).
+    """
+    W = np.asarray(W, dtype=float).reshape(A.shape[0], -1)
+    P = sparse.csc_matrix(P)
+    covered = (sparse.csr_matrix(A).astype(np.int32) @ P) > 0
+    covered_weight = np.asarray(covered.T.astype(float) @ W)   # plans x schemes
+    total_weight = W.sum(axis=0)
+    n_plans, n_s = covered_weight.shape
+    with np.errstate(invalid="ignore", divide="ignore"):
+        risk = np.where(total_weight > 0, 100.0 * covered_weight / total_weight, 0.0)
+    plans = np.asarray(list(names) if names is not None else np.arange(n_plans), dtype=object)
+    schemes = np.asarray(list(scheme_names) if scheme_names is not None else np.arange(n_s), dtype=object)
+    return pd.DataFrame({
+        "plan": np.repeat(plans, n_s),
+        "scheme": np.tile(schemes, n_plans),
+        "n_cameras": np.repeat(np.diff(P.indptr), n_s),
+        "covered_weight": covered_weight.ravel(),
+        "total_weight": np.tile(total_weight, n_plans),
+        "coverage_risk_percent": risk.ravel(),
+    })
+
+def evaluate_layouts(demand_xy, weights, layouts: dict, radius: float) -> pd.DataFrame:
+    """
+    Score arbitrary camera layouts {name: (n, 2) xy array or camera DataFrame} by the
+    demand within `radius` of any of their cameras. All layouts' cameras are deduplicated
+    into one site set, so there is a single (cached) coverage matrix and one sparse
+    product for the whole batch.
+    """
+    names = list(layouts)
+    coords = [camera_xy(v) if isinstance(v, pd.DataFrame) else np.asarray(v, dtype=float).reshape(-1, 2)
+              for v in layouts.values()]
+    stacked = np.concatenate(coords) if coords else np.zeros((0, 2))
+    sites, inverse = np.unique(stacked, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    bounds = np.cumsum([0] + [c.shape[0] for c in coords])
+    plans = [inverse[bounds[k]:bounds[k + 1]] for k in range(len(coords))]
+
+    A = build_coverage_matrix(demand_xy, sites, radius)
+    return evaluate_plans(A, weights, plan_matrix(plans, sites.shape[0]), names=names)
@@ -0,0 +1,119 @@
+# models/optimization/greedy.py
+import heapq
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+GREEDY_RATIO = 1.0 - 1.0 / np.e  # greedy >= (1 - 1/e) * optimum for max coverage
+
+#utils -
+def lazy_greedy(A: sparse.csr_matrix, weights, K_max: int) -> dict:
+    """
+    Lazy-greedy maximum coverage on a sparse coverage matrix (rows = demand, cols = sites).
+    Marginal gains sit in a max-heap and are only re-evaluated when they reach the top
+    (gains never grow as more demand is covered), so one pass gives the greedy plan for
+    every K <= K_max: the first K picks are the greedy solution with budget K.
+
+    Returns {"order": site positions in pick order, "gain": marginal weight of each pick,
+             "covered_weight": cumulative covered weight after each pick,
+             "covered_cells": cumulative covered demand rows after each pick,
+             "covered": final covered mask}.
+    """
+    A = sparse.csr_matrix(A)
+    w = np.asarray(weights, dtype=float)
+    At = A.T.tocsr()  # site -> demand rows it covers
+    indptr, indices = At.indptr, At.indices
+    covered = np.zeros(A.shape[0], dtype=bool)
+
+    gains0 = At @ w
+    heap = [(-g, j) for j, g in enumerate(gains0) if indptr[j + 1] > indptr[j]]
+    heapq.heapify(heap)
+
+    order, gain, cum_w, cum_c = [], [], [], []
+    total_w, total_c = 0.0, 0
+    while heap and len(order) < K_max:
+        neg_g, j = heapq.heappop(heap)
+        rows = indices[indptr[j]:indptr[j + 1]]
+        fresh = rows[~covered[rows]]
+        g = float(w[fresh].sum())
+        if heap and g < -heap[0][0] - 1e-12:
+            heapq.heappush(heap, (-g, j))  # stale: re-queue with the current gain
+            continue
+        covered[fresh] = True
+        total_w += g
+        total_c += fresh.size
+        order.append(j); gain.append(g); cum_w.append(total_w); cum_c.append(total_c)
+
+    return {
+        "order": np.array(order, dtype=np.int64),
+        "gain": np.array(gain),
+        "covered_weight": np.array(cum_w),
+        "covered_cells": np.array(cum_c, dtype=np.int64),
+        "covered": covered,
+    }
+
+def k_curve(A: sparse.csr_matrix, weights, K_max: int, site_ids=None) -> pd.DataFrame:
+    """
+    Coverage-vs-K curve for K = 1..K_max from one lazy-greedy pass.
+    upper_bound_risk_percent is the (1 - 1/e) guarantee turned around: the optimum for
+    that K can be at most greedy / (1 - 1/e).
+    """
+    w = np.asarray(weights, dtype=float)
+    res = lazy_greedy(A, w, K_max)
+    n = res["order"].size
+    total_w, total_c = w.sum(), A.shape[0]
+    risk = 100.0 * res["covered_weight"] / total_w if total_w > 0 else np.zeros(n)
+    return pd.DataFrame({
+        "K": np.arange(1, n + 1),
+        "site_id": np.asarray(site_ids)[res["order"]] if site_ids is not None else res["order"],
+        "marginal_weight": res["gain"],
+        "covered_weight": res["covered_weight"],
+        "coverage_cells_percent": 100.0 * res["covered_cells"] / total_c if total_c > 0 else np.zeros(n),
+        "coverage_risk_percent": risk,
+        "upper_bound_risk_percent": np.minimum(100.0, risk / GREEDY_RATIO),
+    })
+
+def greedy_multi(A: sparse.csr_matrix, W, K_max: int) -> dict:
+    """
+    Plain greedy for every weight column of W (demand x schemes) at once. Site gains for all
+    schemes live in one (sites x schemes) array; after each round the rows newly covered in
+    each scheme go into one sparse (demand x schemes) matrix D and all gains drop by A.T @ D,
+    so a round is a single sparse product whatever the number of schemes.
+    Returns {"order": (K, n_schemes) site positions (-1 once nothing is left to cover),
+             "covered_weight": (K, n_schemes) cumulative covered weight}.
+    """
+    A = sparse.csr_matrix(A).astype(np.float64)
+    W = np.asarray(W, dtype=float).reshape(A.shape[0], -1)
+    n_i, n_s = W.shape
+    At = A.T.tocsr()
+    gains = np.asarray(At @ W)
+    covered = np.zeros((n_i, n_s), dtype=bool)
+    cols = np.arange(n_s)
+
+    order = np.full((K_max, n_s), -1, dtype=np.int64)
+    cum_w = np.zeros((K_max, n_s))
+    total = np.zeros(n_s)
+    for k in range(K_max):
+        pick = gains.argmax(axis=0)
+        live = gains[pick, cols] > 0
+        rows, sch = [], []
+        for s in np.flatnonzero(live):
+            r = At.indices[At.indptr[pick[s]]:At.indptr[pick[s] + 1]]
+            r = r[~covered[r, s]]
+            rows.append(r); sch.append(np.full(r.size, s))
+        if rows:
+            rows, sch = np.concatenate(rows), np.concatenate(sch)
+            covered[rows, sch] = True
+            total += np.bincount(sch, weights=W[rows, sch], minlength=n_s)
+            D = sparse.csr_matrix((W[rows, sch], (rows, sch)), shape=(n_i, n_s))
+            gains -= np.asarray((At @ D).todense())
+            gains[pick[live], cols[live]] = -np.inf  # never pick a site twice (zero-gain ties)
+        order[k, live] = pick[live]
+        cum_w[k] = total
+    return {"order": order, "covered_weight": cum_w}
+
+def greedy_sites(A: sparse.csr_matrix, weights, K: int) -> np.ndarray:
+    """Boolean site mask of the greedy plan with budget K."""
+    mask = np.zeros(A.shape[1], dtype=bool)
+    mask[lazy_greedy(A, weights, K)["order"]] = True
+    return mask
@@ -0,0 +1,127 @@
+# models/optimization/mobile_schedule.py
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from coverage import build_coverage_matrix, xy
+from demand_points import LATTICE_M, valid_points, candidate_sites, lattice_index
+from greedy import greedy_multi, lazy_greedy
+
+SEASONS = {12: "winter", 1: "winter", 2: "winter", 3: "spring", 4: "spring", 5: "spring",
+           6: "summer", 7: "summer", 8: "summer", 9: "fall", 10: "fall", 11: "fall"}
+
+#utils -
+def period_labels(collisions: pd.DataFrame, period: str = "month") -> pd.Series:
+    """
+    Period of every collision from its date: "month" (1-12, pooled over years),
+    "season" (winter / spring / summer / fall) or "year_month" (e.g. 2023-07).
+    """
+    date = pd.to_datetime(collisions["date"], errors="coerce")
+    if period == "month":
+        return date.dt.month
+    if period == "season":
+        return date.dt.month.map(SEASONS)
+    if period == "year_month":
+        return date.dt.to_period("M").astype(str)
+    raise ValueError(f"unknown period {period!r}")
+
+def period_weights(collisions: pd.DataFrame, period: str = "month", lattice_m: float = LATTICE_M,
+                   severity_weights: dict = None) -> tuple:
+    """
+    Time-sliced demand: the aggregate_demand lattice points of all collisions, with one
+    severity-weight column per period. Every period shares the demand rows, so one
+    coverage matrix serves the whole schedule.
+    Returns (demand frame with demand_id / x_coord / y_coord, (n_demand x n_periods) W, periods).
+    """
+    pts, w, ok = valid_points(collisions, severity_weights, return_mask=True)
+    labels = period_labels(collisions, period)[ok]
+    has_period = labels.notna().to_numpy()
+    keys, inv = lattice_index(pts, lattice_m)
+    periods, p_idx = np.unique(labels[has_period].to_numpy(), return_inverse=True)
+
+    W = sparse.coo_matrix((w[has_period], (inv[has_period], p_idx.ravel())),
+                          shape=(keys.shape[0], periods.size)).toarray()
+    demand = pd.DataFrame({
+        "demand_id": np.arange(keys.shape[0]),
+        "x_coord": (keys[:, 0] + 0.5) * lattice_m,
+        "y_coord": (keys[:, 1] + 0.5) * lattice_m,
+    })
+    return demand, W, periods
+
+def schedule_mobile(A: sparse.csr_matrix, W, K: int, max_visits: int = None, min_gap: int = 0) -> np.ndarray:
+    """
+    Assign K mobile cameras to sites in every period (column of W), period by period.
+    Without rotation rules the periods are independent and all are solved in one greedy_multi
+    pass. max_visits caps how many periods a site can host a camera; min_gap = g keeps a site
+    empty for g periods after a visit (min_gap=1: no site twice in a row). Each period is one
+    lazy-greedy solve over the still-allowed sites, so the work is linear in the periods.
+    Returns (n_periods x K) site positions, -1 for unused cameras.
+    """
+    A = sparse.csr_matrix(A)
+    W = np.asarray(W, dtype=float).reshape(A.shape[0], -1)
+    n_sites, n_periods = A.shape[1], W.shape[1]
+    if not max_visits and not min_gap:
+        return greedy_multi(A, W, K)["order"].T
+
+    Ac = A.tocsc()
+    visits = np.zeros(n_sites, dtype=np.int64)
+    last = np.full(n_sites, -(10 ** 9), dtype=np.int64)
+    out = np.full((n_periods, K), -1, dtype=np.int64)
+    for t in range(n_periods):
+        allowed = t - last > min_gap
+        if max_visits:
+            allowed &= visits < max_visits
+        cols = np.flatnonzero(allowed)
+        picks = cols[lazy_greedy(Ac[:, cols].tocsr(), W[:, t], K)["order"]]
+        out[t, :picks.size] = picks
+        visits[picks] += 1
+        last[picks] = t
+    return out
+
+def coverage_by_period(A: sparse.csr_matrix, W, schedule: np.ndarray) -> np.ndarray:
+    """Covered weight of each period's own plan, as a share (%) of that period's weight."""
+    A = sparse.csr_matrix(A)
+    W = np.asarray(W, dtype=float).reshape(A.shape[0], -1)
+    pct = np.zeros(W.shape[1])
+    for t, row in enumerate(schedule):
+        mask = np.zeros(A.shape[1], dtype=np.int32)
+        mask[row[row >= 0]] = 1
+        covered = (A @ mask) > 0
+        total = W[:, t].sum()
+        pct[t] = 100.0 * W[covered, t].sum() / total if total > 0 else 0.0
+    return pct
+
+def mobile_deployment(collisions: pd.DataFrame, K: int, radius: float, period: str = "month",
+                      lattice_m: float = LATTICE_M, top_n: int = 1500, max_visits: int = None,
+                      min_gap: int = 0, severity_weights: dict = None) -> tuple:
+    """
+    Mobile-camera schedule on collision-location candidates (demand_points.candidate_sites).
+    Returns (schedule frame: period, camera, site_id, x_coord, y_coord;
+             per-period frame: period, total_weight, coverage_risk_percent and
+             static_risk_percent, the coverage of one fixed plan solved on the pooled weights).
+    """
+    demand, W, periods = period_weights(collisions, period, lattice_m, severity_weights)
+    sites = candidate_sites(collisions, top_n=top_n, min_spacing_m=lattice_m, severity_weights=severity_weights)
+    A = build_coverage_matrix(xy(demand), xy(sites), radius)
+
+    schedule = schedule_mobile(A, W, K, max_visits=max_visits, min_gap=min_gap)
+    static = lazy_greedy(A, W.sum(axis=1), K)["order"]
+    static_schedule = np.full((len(periods), K), -1, dtype=np.int64)
+    static_schedule[:, :static.size] = static
+
+    t, cam = np.nonzero(schedule >= 0)
+    pos = schedule[t, cam]
+    plan = pd.DataFrame({
+        "period": periods[t],
+        "camera": cam,
+        "site_id": sites["site_id"].to_numpy()[pos],
+        "x_coord": sites["x_coord"].to_numpy()[pos],
+        "y_coord": sites["y_coord"].to_numpy()[pos],
+    })
+    summary = pd.DataFrame({
+        "period": periods,
+        "total_weight": W.sum(axis=0),
+        "coverage_risk_percent": coverage_by_period(A, W, schedule),
+        "static_risk_percent": coverage_by_period(A, W, static_schedule),
+    })
+    return plan, summary
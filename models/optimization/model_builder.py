@@ -0,0 +1,128 @@
+# models/optimization/model_builder.py
+import numpy as np
+import pulp as pl
+from scipy import sparse
+
+#utils -
+def build_max_coverage_model(A: sparse.csr_matrix, weights, K: int, site_ids, demand_ids,
+                             name: str = "Camera_Placement_MaxCoverage"):
+    """
+    Maximum-coverage model in PuLP from a sparse coverage matrix (rows = demand, cols = sites).
+
+        max  sum_i w_i * y_i
+        s.t. sum_{j: a_ij = 1} x_j >= y_i     (Coverage_i)
+             sum_j x_j <= K                   (Camera_Budget)
+
+    Coverage constraints come straight from CSR row slices. Demand rows with zero weight or
+    no covering site cannot change the objective, so they get no y_i / constraint at all
+    (instead of the old NoCoverage_i equalities).
+    Returns (model, x, y) with x keyed by site id and y keyed by (kept) demand id.
+    """
+    A = sparse.csr_matrix(A)
+    w = np.asarray(weights, dtype=float)
+    site_ids = list(site_ids)
+    demand_ids = list(demand_ids)
+    if A.shape != (len(demand_ids), len(site_ids)) or w.shape[0] != len(demand_ids):
+        raise ValueError(f"coverage matrix {A.shape} does not match "
+                         f"{len(demand_ids)} demand ids / {len(weights)} weights x {len(site_ids)} sites")
+
+    m = pl.LpProblem(name, pl.LpMaximize)
+    x = pl.LpVariable.dicts("x", site_ids, lowBound=0, upBound=1, cat="Binary")
+    x_cols = [x[j] for j in site_ids]
+    y = add_coverage_rows(m, A, w, x_cols, demand_ids)
+
+    m.addConstraint(pl.LpConstraint(pl.LpAffineExpression([(v, 1) for v in x_cols]),
+                                    sense=pl.LpConstraintLE, rhs=K), "Camera_Budget")
+    return m, x, y
+
+def add_coverage_rows(m: pl.LpProblem, A: sparse.csr_matrix, w: np.ndarray, cols: list, demand_ids) -> dict:
+    """
+    Objective sum_i w_i * y_i and one Coverage_i row per useful demand row, read from the CSR
+    row slices of A; cols[j] is the PuLP variable of column j. Returns y keyed by demand id.
+    """
+    demand_ids = list(demand_ids)
+    keep = np.flatnonzero((w > 0) & (np.diff(A.indptr) > 0))
+    y = {demand_ids[i]: pl.LpVariable(f"y_{demand_ids[i]}", lowBound=0, upBound=1, cat="Binary")
+         for i in keep}
+
+    m += pl.LpAffineExpression([(y[demand_ids[i]], w[i]) for i in keep]), "Total_Weighted_Coverage"
+
+    indptr, indices = A.indptr, A.indices
+    for i in keep:
+        yi = y[demand_ids[i]]
+        terms = [(cols[j], 1) for j in indices[indptr[i]:indptr[i + 1]]]
+        terms.append((yi, -1))
+        m.addConstraint(pl.LpConstraint(pl.LpAffineExpression(terms), sense=pl.LpConstraintGE, rhs=0),
+                        f"Coverage_{demand_ids[i]}")
+    return y
+
+def solve(m: pl.LpProblem, msg: bool = False, time_limit: float = None, warm_start: bool = False) -> str:
+    """Solve with CBC; returns the PuLP status string. warm_start passes the variables'
+    initial values (see set_initial_solution) to CBC as a MIP start."""
+    m.solve(pl.PULP_CBC_CMD(msg=msg, timeLimit=time_limit, warmStart=warm_start))
+    return pl.LpStatus[m.status]
+
+def set_budget(m: pl.LpProblem, K: int):
+    """Change only the right-hand side of Camera_Budget, keeping the rest of the model."""
+    m.constraints["Camera_Budget"].changeRHS(K)
+
+def set_initial_solution(A: sparse.csr_matrix, x: dict, y: dict, site_ids, demand_ids, site_mask):
+    """
+    Load a previous plan (boolean mask over site_ids) as the MIP start: x_j from the plan,
+    y_i = 1 for the kept demand rows the plan covers. Any plan with at most K sites is feasible.
+    """
+    site_mask = np.asarray(site_mask, dtype=bool)
+    covered = (sparse.csr_matrix(A) @ site_mask.astype(np.int32)) > 0
+    for j, chosen in zip(site_ids, site_mask):
+        x[j].setInitialValue(1 if chosen else 0)
+    for i, cov in zip(demand_ids, covered):
+        if i in y:
+            y[i].setInitialValue(1 if cov else 0)
+
+def chosen_mask(x: dict, site_ids) -> np.ndarray:
+    """Boolean mask over site_ids of the sites with x_j = 1."""
+    return np.array([x[j].value() is not None and x[j].value() > 0.5 for j in site_ids])
+
+def coverage_summary(A: sparse.csr_matrix, weights, site_mask) -> dict:
+    """
+    Coverage of a set of chosen sites, read off the coverage matrix (not the y_i values,
+    which are only defined for the demand rows kept in the model).
+    """
+    w = np.asarray(weights, dtype=float)
+    covered = (sparse.csr_matrix(A) @ np.asarray(site_mask, dtype=np.int32)) > 0
+    total_cells, total_weight = w.shape[0], w.sum()
+    covered_cells, covered_weight = int(covered.sum()), float(w[covered].sum())
+    return {
+        "covered": covered,
+        "covered_cells": covered_cells,
+        "total_cells": total_cells,
+        "coverage_cells_percent": 100.0 * covered_cells / total_cells if total_cells > 0 else 0.0,
+        "covered_weight": covered_weight,
+        "total_weight": total_weight,
+        "coverage_risk_percent": 100.0 * covered_weight / total_weight if total_weight > 0 else 0.0,
+    }
+
+def solve_budget_sweep(A: sparse.csr_matrix, weights, Ks, site_ids, demand_ids, start_mask=None,
+                       time_limit: float = None, name: str = "Camera_Placement_MaxCoverage") -> list:
+    """
+    Solve the same coverage model for several budgets in increasing K. The PuLP problem is
+    built once; each step only changes the Camera_Budget RHS and warm-starts CBC from the
+    previous solution (still feasible when K grows). start_mask seeds the first solve,
+    e.g. a greedy plan or the solution of a neighbouring radius.
+    Returns [(K, status, site_mask), ...] in increasing K.
+    """
+    Ks = sorted(Ks)
+    m, x, y = build_max_coverage_model(A, weights, Ks[0], site_ids, demand_ids, name=name)
+    mask = None if start_mask is None else np.asarray(start_mask, dtype=bool)
+    if mask is not None and mask.sum() > Ks[0]:
+        mask = None  # too many sites for the smallest budget: start cold
+
+    out = []
+    for K in Ks:
+        set_budget(m, K)
+        if mask is not None:
+            set_initial_solution(A, x, y, site_ids, demand_ids, mask)
+        status = solve(m, time_limit=time_limit, warm_start=mask is not None)
+        mask = chosen_mask(x, site_ids)
+        out.append((K, status, mask))
+    return out
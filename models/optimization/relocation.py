@@ -0,0 +1,121 @@
+# models/optimization/relocation.py
+import numpy as np
+import pandas as pd
+import pulp as pl
+from scipy import sparse
+
+from coverage import build_coverage_matrix
+from model_builder import add_coverage_rows, solve
+
+# budget_calculator.budget() unit costs
+MOVE_COST = 10000   # relocating an existing camera
+NEW_COST = 50000    # building a new camera
+
+#utils -
+def build_relocation_model(A_sites: sparse.csr_matrix, A_existing: sparse.csr_matrix, weights,
+                           site_ids, demand_ids, dollar_budget: float, move_cost: float = MOVE_COST,
+                           new_cost: float = NEW_COST, max_cameras: int = None,
+                           name: str = "Camera_Relocation_MaxCoverage"):
+    """
+    Maximum coverage with the existing active cameras pre-placed and the plan priced
+    inside the model (instead of optimize -> budget() -> adjust K by hand).
+
+        max  sum_i w_i * y_i
+        s.t. sum_{j covers i} x_j + sum_{e covers i} keep_e >= y_i        (Coverage_i)
+             sum_j x_j = moves + builds                                  (Placement_Source)
+             moves <= sum_e (1 - keep_e)                                 (Freed_Cameras)
+             move_cost * moves + new_cost * builds <= dollar_budget      (Dollar_Budget)
+             sum_j x_j + sum_e keep_e <= max_cameras  (optional)         (Camera_Budget)
+
+    keep_e = 1 leaves existing camera e where it is at zero cost; a camera taken down can be
+    moved to a candidate site for move_cost, any further site needs a new camera. Both
+    coverage blocks share the demand rows, so the model is one CSR slice per row of
+    [A_sites | A_existing] and stays sparse at 1,500+ candidates.
+    Returns (model, x, keep, y, moves, builds).
+    """
+    A = sparse.hstack([sparse.csr_matrix(A_sites), sparse.csr_matrix(A_existing)], format="csr")
+    w = np.asarray(weights, dtype=float)
+    site_ids = list(site_ids)
+    n_existing = A_existing.shape[1]
+    if A.shape[0] != len(demand_ids) or A_sites.shape[1] != len(site_ids) or w.shape[0] != A.shape[0]:
+        raise ValueError(f"coverage matrices {A_sites.shape} / {A_existing.shape} do not match "
+                         f"{len(demand_ids)} demand ids / {len(weights)} weights x {len(site_ids)} sites")
+
+    m = pl.LpProblem(name, pl.LpMaximize)
+    x = pl.LpVariable.dicts("x", site_ids, lowBound=0, upBound=1, cat="Binary")
+    keep = [pl.LpVariable(f"keep_{e}", lowBound=0, upBound=1, cat="Binary") for e in range(n_existing)]
+    moves = pl.LpVariable("moves", lowBound=0, cat="Integer")
+    builds = pl.LpVariable("builds", lowBound=0, cat="Integer")
+    x_cols = [x[j] for j in site_ids]
+    y = add_coverage_rows(m, A, w, x_cols + keep, demand_ids)
+
+    placed = [(v, 1) for v in x_cols]
+    m.addConstraint(pl.LpConstraint(pl.LpAffineExpression(placed + [(moves, -1), (builds, -1)]),
+                                    sense=pl.LpConstraintEQ, rhs=0), "Placement_Source")
+    m.addConstraint(pl.LpConstraint(pl.LpAffineExpression([(moves, 1)] + [(k, 1) for k in keep]),
+                                    sense=pl.LpConstraintLE, rhs=n_existing), "Freed_Cameras")
+    m.addConstraint(pl.LpConstraint(pl.LpAffineExpression([(moves, move_cost), (builds, new_cost)]),
+                                    sense=pl.LpConstraintLE, rhs=dollar_budget), "Dollar_Budget")
+    if max_cameras is not None:
+        m.addConstraint(pl.LpConstraint(pl.LpAffineExpression(placed + [(k, 1) for k in keep]),
+                                        sense=pl.LpConstraintLE, rhs=max_cameras), "Camera_Budget")
+    return m, x, keep, y, moves, builds
+
+def set_dollar_budget(m: pl.LpProblem, dollar_budget: float):
+    """Change only the right-hand side of Dollar_Budget (budget sweeps reuse the model)."""
+    m.constraints["Dollar_Budget"].changeRHS(dollar_budget)
+
+def optimize_with_relocation(demand_xy, weights, site_xy, site_ids, demand_ids, existing_xy,
+                             radius: float, dollar_budget: float, move_cost: float = MOVE_COST,
+                             new_cost: float = NEW_COST, max_cameras: int = None,
+                             time_limit: float = None, msg: bool = False) -> tuple:
+    """
+    Build (cached coverage matrices), solve and read back a relocation plan.
+    Returns (summary dict, plan frame). The plan lists every camera of the new layout with
+    action "keep" (existing, unchanged), "move" or "build"; which freed camera goes to which
+    new site does not change the cost, so the first placements are labelled as moves.
+    """
+    site_ids = np.asarray(site_ids)
+    site_xy = np.asarray(site_xy, dtype=float)
+    existing_xy = np.asarray(existing_xy, dtype=float)
+    A_sites = build_coverage_matrix(demand_xy, site_xy, radius)
+    A_existing = build_coverage_matrix(demand_xy, existing_xy, radius)
+
+    m, x, keep, _, _, _ = build_relocation_model(
+        A_sites, A_existing, weights, site_ids, demand_ids, dollar_budget,
+        move_cost=move_cost, new_cost=new_cost, max_cameras=max_cameras)
+    status = solve(m, msg=msg, time_limit=time_limit)
+
+    site_mask = np.array([x[j].value() is not None and x[j].value() > 0.5 for j in site_ids])
+    keep_mask = np.array([k.value() is not None and k.value() > 0.5 for k in keep], dtype=bool)
+    n_moves = int(min(site_mask.sum(), (~keep_mask).sum()))
+    n_builds = int(site_mask.sum()) - n_moves
+    # taking a camera down is free but gains nothing unless it is moved: leave the rest in place
+    keep_mask[np.flatnonzero(~keep_mask)[n_moves:]] = True
+
+    w = np.asarray(weights, dtype=float)
+    covered = ((A_sites @ site_mask.astype(np.int32)) + (A_existing @ keep_mask.astype(np.int32))) > 0
+    total_weight = float(w.sum())
+    summary = {
+        "status": status,
+        "dollar_budget": dollar_budget,
+        "kept": int(keep_mask.sum()),
+        "removed": int((~keep_mask).sum()),
+        "moved": n_moves,
+        "built": n_builds,
+        "cost": n_moves * move_cost + n_builds * new_cost,
+        "n_cameras": int(keep_mask.sum() + site_mask.sum()),
+        "coverage_cells_percent": 100.0 * int(covered.sum()) / w.shape[0] if w.shape[0] > 0 else 0.0,
+        "coverage_risk_percent": 100.0 * float(w[covered].sum()) / total_weight if total_weight > 0 else 0.0,
+    }
+
+    new_xy = site_xy[site_mask]
+    action = np.where(np.arange(new_xy.shape[0]) < n_moves, "move", "build")
+    plan = pd.concat([
+        pd.DataFrame({"site_id": -1, "existing_idx": np.flatnonzero(keep_mask),
+                      "x_coord": existing_xy[keep_mask, 0], "y_coord": existing_xy[keep_mask, 1],
+                      "action": "keep"}),
+        pd.DataFrame({"site_id": site_ids[site_mask], "existing_idx": -1,
+                      "x_coord": new_xy[:, 0], "y_coord": new_xy[:, 1], "action": action}),
+    ], ignore_index=True)
+    return summary, plan
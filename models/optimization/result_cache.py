@@ -0,0 +1,82 @@
+# models/optimization/result_cache.py
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from coverage import array_key
+
+CACHE_DIR = Path(__file__).resolve().parent / ".solution_cache"
+MAX_ENTRIES = 256
+
+#utils -
+def solution_key(demand_xy, weights, site_xy, K: int, radius: float, solver: str = "cbc",
+                 time_limit: float = None, **settings) -> str:
+    """
+    Content hash of everything a solve depends on: demand coordinates, weight vector,
+    candidate coordinates, K, radius and solver settings. Same inputs -> same key in any
+    notebook or process.
+    """
+    h = hashlib.sha1()
+    for a in (demand_xy, weights, site_xy):
+        h.update(array_key(a).encode())
+    meta = {"K": int(K), "radius": float(radius), "solver": solver, "time_limit": time_limit, **settings}
+    h.update(json.dumps(meta, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+def _paths(cache_dir: Path, key: str):
+    return cache_dir / f"{key}.json", cache_dir / f"{key}_sites.csv"
+
+def load_solution(key: str, cache_dir=CACHE_DIR):
+    """
+    (metadata dict, sites frame) for a cached key, or None. A hit refreshes its LRU time.
+    An entry evicted by another process while it is read counts as a miss.
+    """
+    meta_path, sites_path = _paths(Path(cache_dir), key)
+    try:
+        os.utime(meta_path)  # mtime = last use
+        with open(meta_path) as fh:
+            meta = json.load(fh)
+        return meta, pd.read_csv(sites_path)
+    except FileNotFoundError:
+        return None
+
+def store_solution(key: str, meta: dict, sites: pd.DataFrame, cache_dir=CACHE_DIR,
+                   max_entries: int = MAX_ENTRIES):
+    """
+    Write the chosen sites (optimal_camera_sites layout) and metadata (objective, coverage
+    metrics, scenario settings) under key, then evict the least recently used entries
+    beyond max_entries.
+    """
+    cache_dir = Path(cache_dir); cache_dir.mkdir(parents=True, exist_ok=True)
+    meta_path, sites_path = _paths(cache_dir, key)
+    sites.to_csv(sites_path, index=False)
+    meta = {k: (v.item() if isinstance(v, np.generic) else v) for k, v in meta.items()}
+    tmp = meta_path.with_suffix(f".{os.getpid()}.tmp")  # per process: workers may store the same key
+    with open(tmp, "w") as fh:
+        json.dump({**meta, "key": key, "stored_at": time.time()}, fh, indent=1, default=str)
+    os.replace(tmp, meta_path)  # metadata last: an entry is only visible once complete
+    evict(cache_dir, max_entries)
+
+def evict(cache_dir=CACHE_DIR, max_entries: int = MAX_ENTRIES) -> int:
+    """
+    Drop the least recently used entries until at most max_entries remain; returns how many.
+    Pool workers share the directory, so entries another process removes meanwhile are skipped.
+    """
+    entries = []
+    for meta_path in Path(cache_dir).glob("*.json"):
+        try:
+            entries.append((meta_path.stat().st_mtime, meta_path))
+        except FileNotFoundError:
+            continue
+    entries = [p for _, p in sorted(entries, reverse=True)]
+    for meta_path in entries[max_entries:]:
+        for p in _paths(meta_path.parent, meta_path.stem):
+            p.unlink(missing_ok=True)
+    return max(len(entries) - max_entries, 0)
+
+def clear_solution_cache(cache_dir=CACHE_DIR):
+    evict(cache_dir, 0)
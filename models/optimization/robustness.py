@@ -0,0 +1,93 @@
+# models/optimization/robustness.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from coverage import build_coverage_matrix, xy
+from greedy import greedy_multi
+from weights import DEFAULT_SCHEME, weight_matrix
+
+TOP_N_CANDIDATES = 1500
+CHUNK = 64  # weight columns per pool task
+
+# per-process coverage matrix, set once by the pool initializer
+_A = None
+
+#utils -
+def perturbed_weights(grid_df: pd.DataFrame, n_draws: int, seed: int = 0, bootstrap: bool = True,
+                      weather_sd: float = 0.25, scheme: dict = None) -> np.ndarray:
+    """
+    (n_cells x n_draws) weight matrix of perturbed copies of the scheme's weights.
+    bootstrap: collision counts are a multinomial resample of all collisions over the cells
+    (a bootstrap of the collision records at grid level).
+    weather_sd: each draw scales weather_coef by exp(N(0, weather_sd)), i.e. a wetter or
+    drier weighting of the precip / snow term.
+    Each draw is weight_matrix with collision_count = 1 (the per-cell factor) times its counts.
+    """
+    rng = np.random.default_rng(seed)
+    s = {**DEFAULT_SCHEME, **(scheme or {})}
+    schemes = [{**s, "name": f"draw_{k}", "weather_coef": s["weather_coef"] * np.exp(rng.normal(0, weather_sd))}
+               for k in range(n_draws)]
+    if s["severity"]:
+        factor = weight_matrix(grid_df, schemes)
+        counts = np.ones((grid_df.shape[0], n_draws))
+    else:
+        factor = weight_matrix(grid_df.assign(collision_count=1), schemes)
+        counts = grid_df["collision_count"].to_numpy(dtype=float)[:, None].repeat(n_draws, axis=1)
+    if bootstrap:
+        n = int(grid_df["collision_count"].sum())
+        p = grid_df["collision_count"].to_numpy(dtype=float) / max(n, 1)
+        boot = rng.multinomial(n, p, size=n_draws).T
+        counts = counts * boot / np.where(grid_df["collision_count"].to_numpy() > 0,
+                                          grid_df["collision_count"].to_numpy(), 1)[:, None]
+    return factor * counts
+
+def _init_worker(A):
+    global _A
+    _A = A
+
+def _solve_chunk(W: np.ndarray, K: int) -> np.ndarray:
+    return greedy_multi(_A, W, K)["order"]
+
+def selection_frequency(A, W: np.ndarray, K: int, max_workers: int = None, chunk: int = CHUNK) -> tuple:
+    """
+    Greedy plan with budget K for every column of W, in column chunks over a process pool
+    that holds A once per worker. Returns (per-site selection counts, (K x n_draws) orders).
+    """
+    max_workers = max_workers or os.cpu_count()
+    chunks = [W[:, k:k + chunk] for k in range(0, W.shape[1], chunk)]
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(A,)) as pool:
+        orders = np.hstack(list(pool.map(_solve_chunk, chunks, [K] * len(chunks))))
+    picked = orders[orders >= 0]
+    return np.bincount(picked, minlength=A.shape[1]), orders
+
+def site_robustness(grid_df: pd.DataFrame, K: int, radius: float, n_draws: int = 1000, seed: int = 0,
+                    bootstrap: bool = True, weather_sd: float = 0.25, scheme: dict = None,
+                    top_n: int = TOP_N_CANDIDATES, max_workers: int = None) -> pd.DataFrame:
+    """
+    Monte-Carlo stability of the optimal sites: candidates (top-N cells by unperturbed weight)
+    and their coverage matrix are fixed, n_draws perturbed weight vectors are solved with the
+    multi-column greedy, and each candidate gets the share of draws whose plan picked it.
+    in_base_plan marks the greedy plan of the unperturbed weights.
+    Returns site_id, x_coord, y_coord, selected, frequency, in_base_plan (most stable first).
+    """
+    w0 = weight_matrix(grid_df, [scheme or {}])[:, 0]
+    cand_pos = np.argsort(-w0, kind="stable")[:top_n]
+    site_xy = xy(grid_df)[cand_pos]
+    A = build_coverage_matrix(xy(grid_df), site_xy, radius)
+
+    W = perturbed_weights(grid_df, n_draws, seed=seed, bootstrap=bootstrap, weather_sd=weather_sd, scheme=scheme)
+    counts, _ = selection_frequency(A, W, K, max_workers=max_workers)
+    base = greedy_multi(A, w0, K)["order"][:, 0]
+
+    out = pd.DataFrame({
+        "site_id": grid_df["cell_id"].to_numpy()[cand_pos],
+        "x_coord": site_xy[:, 0],
+        "y_coord": site_xy[:, 1],
+        "selected": counts,
+        "frequency": counts / n_draws,
+        "in_base_plan": np.isin(np.arange(cand_pos.size), base[base >= 0]),
+    })
+    out = out[(out["selected"] > 0) | out["in_base_plan"]]
+    return out.sort_values("frequency", ascending=False, kind="stable").reset_index(drop=True)
@@ -0,0 +1,207 @@
+# models/optimization/scenario_runner.py
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from coverage import build_coverage_matrix, xy
+from greedy import greedy_sites
+from model_builder import build_max_coverage_model, chosen_mask, coverage_summary, solve, solve_budget_sweep
+from result_cache import load_solution, solution_key, store_solution
+from weights import DEFAULT_SCHEME, risk_weights
+
+TOP_N_CANDIDATES = 1500
+RESULT_COLS = ["scenario", "K", "RADIUS", "weights", "solver", "status",
+               "coverage_cells_percent", "coverage_risk_percent", "seconds"]
+
+# per-process inputs, filled once by the pool initializer: (scheme name, radius) -> problem data
+_INPUTS = {}
+
+#utils -
+def check_scheme_names(schemes):
+    """Inputs, results and cache labels are keyed by scheme name, so a name must mean one set of coefficients."""
+    seen = {}
+    for scheme in schemes:
+        full = {**DEFAULT_SCHEME, **scheme}
+        if seen.setdefault(full["name"], full) != full:
+            raise ValueError(f"weight scheme name {full['name']!r} is used for different coefficients")
+
+def scenario_grid(Ks, radii, schemes=(DEFAULT_SCHEME,)) -> list:
+    """Every (K, radius, weight scheme) combination, named like the notebook (K150_R500[_scheme])."""
+    check_scheme_names(schemes)
+    out = []
+    for scheme, radius, K in itertools.product(schemes, radii, Ks):
+        suffix = "" if scheme["name"] == DEFAULT_SCHEME["name"] else f"_{scheme['name']}"
+        out.append({"name": f"K{K}_R{radius}{suffix}", "K": K, "RADIUS": radius, "scheme": scheme})
+    return out
+
+def prepare_inputs(grid_df: pd.DataFrame, scenarios, top_n: int = TOP_N_CANDIDATES) -> dict:
+    """
+    Weights, candidate sites (top-N cells by weight) and coverage matrix for every
+    (scheme, radius) used by the scenarios. Scenarios sharing a radius and scheme share A.
+    """
+    check_scheme_names(s["scheme"] for s in scenarios)
+    inputs = {}
+    weights = {}
+    for s in scenarios:
+        name = s["scheme"]["name"]
+        if name not in weights:
+            weights[name] = risk_weights(grid_df, s["scheme"])
+        key = (name, float(s["RADIUS"]))
+        if key in inputs:
+            continue
+        w = weights[name]
+        cand_pos = np.argsort(-w, kind="stable")[:top_n]
+        inputs[key] = {
+            "weights": w,
+            "demand_ids": grid_df["cell_id"].to_numpy(),
+            "demand_xy": xy(grid_df),
+            "site_ids": grid_df["cell_id"].to_numpy()[cand_pos],
+            "site_xy": xy(grid_df)[cand_pos],
+            "A": build_coverage_matrix(xy(grid_df), xy(grid_df)[cand_pos], s["RADIUS"]),
+        }
+    return inputs
+
+def _init_worker(inputs):
+    global _INPUTS
+    _INPUTS = inputs
+
+def _cache_key(d: dict, scenario: dict, solver: str, time_limit: float) -> str:
+    return solution_key(d["demand_xy"], d["weights"], d["site_xy"], scenario["K"], scenario["RADIUS"],
+                        solver=solver, time_limit=time_limit)
+
+def _cached(key: str, scenario: dict, cache_dir, t0: float):
+    """(result row, sites frame) from the solution cache, renamed to this scenario, or None."""
+    hit = load_solution(key, cache_dir) if cache_dir is not None else None
+    if hit is None:
+        return None
+    meta, sites = hit
+    row = {c: meta[c] for c in RESULT_COLS}
+    row.update({"scenario": scenario["name"], "weights": scenario["scheme"]["name"],
+                "status": f"{meta['status']} (cached)", "seconds": time.time() - t0})
+    return row, sites
+
+def solve_scenario(scenario: dict, solver: str = "cbc", time_limit: float = None, cache_dir=None) -> tuple:
+    """
+    Solve one scenario against the shared inputs; returns (result row, chosen-sites frame).
+    With cache_dir, a scenario whose inputs were solved before is read back from the cache.
+    """
+    t0 = time.time()
+    d = _INPUTS[(scenario["scheme"]["name"], float(scenario["RADIUS"]))]
+    A, w = d["A"], d["weights"]
+    key = _cache_key(d, scenario, solver, time_limit)
+    hit = _cached(key, scenario, cache_dir, t0)
+    if hit is not None:
+        return hit
+
+    if solver == "greedy":
+        mask, status = greedy_sites(A, w, scenario["K"]), "greedy"
+    else:
+        m, x, _ = build_max_coverage_model(A, w, scenario["K"], d["site_ids"], d["demand_ids"],
+                                           name=f"Camera_Placement_{scenario['name']}")
+        status = solve(m, time_limit=time_limit)
+        mask = chosen_mask(x, d["site_ids"])
+
+    summary = coverage_summary(A, w, mask)
+    row = {
+        "scenario": scenario["name"], "K": scenario["K"], "RADIUS": scenario["RADIUS"],
+        "weights": scenario["scheme"]["name"], "solver": solver, "status": status,
+        "coverage_cells_percent": summary["coverage_cells_percent"],
+        "coverage_risk_percent": summary["coverage_risk_percent"],
+        "seconds": time.time() - t0,
+    }
+    sites = pd.DataFrame({"site_id": d["site_ids"][mask],
+                          "x_coord": d["site_xy"][mask, 0], "y_coord": d["site_xy"][mask, 1]})
+    if cache_dir is not None:
+        store_solution(key, {**row, "objective": summary["covered_weight"]}, sites, cache_dir)
+    return row, sites
+
+def solve_scenario_group(scenarios, time_limit: float = None, cache_dir=None) -> list:
+    """
+    CBC for several budgets of the same (scheme, radius): one PuLP problem, re-solved in
+    increasing K with only the Camera_Budget RHS changed, each solve warm-started from the
+    previous plan (the first from the greedy plan). Returns [(result row, sites frame), ...].
+    With cache_dir, the group is read back from the cache when every budget is cached.
+    """
+    scenarios = sorted(scenarios, key=lambda s: s["K"])
+    first = scenarios[0]
+    d = _INPUTS[(first["scheme"]["name"], float(first["RADIUS"]))]
+    A, w = d["A"], d["weights"]
+
+    t0 = time.time()
+    keys = [_cache_key(d, s, "cbc_warm", time_limit) for s in scenarios]
+    hits = [_cached(k, s, cache_dir, t0) for k, s in zip(keys, scenarios)]
+    if all(h is not None for h in hits):
+        return hits
+
+    start = greedy_sites(A, w, first["K"])
+    sweep = solve_budget_sweep(A, w, [s["K"] for s in scenarios], d["site_ids"], d["demand_ids"],
+                               start_mask=start, time_limit=time_limit,
+                               name=f"Camera_Placement_{first['name']}")
+    seconds = time.time() - t0
+    out = []
+    for s, key, (_, status, mask) in zip(scenarios, keys, sweep):
+        summary = coverage_summary(A, w, mask)
+        row = {
+            "scenario": s["name"], "K": s["K"], "RADIUS": s["RADIUS"],
+            "weights": s["scheme"]["name"], "solver": "cbc_warm", "status": status,
+            "coverage_cells_percent": summary["coverage_cells_percent"],
+            "coverage_risk_percent": summary["coverage_risk_percent"],
+            "seconds": seconds,  # the whole warm-started sweep
+        }
+        sites = pd.DataFrame({"site_id": d["site_ids"][mask],
+                              "x_coord": d["site_xy"][mask, 0], "y_coord": d["site_xy"][mask, 1]})
+        if cache_dir is not None:
+            store_solution(key, {**row, "objective": summary["covered_weight"]}, sites, cache_dir)
+        out.append((row, sites))
+    return out
+
+def run_scenarios(grid_df: pd.DataFrame, scenarios, out_csv="sensitivity_results.csv",
+                  sites_dir=".", max_workers: int = None, solver: str = "cbc",
+                  time_limit: float = None, top_n: int = TOP_N_CANDIDATES,
+                  warm_start: bool = False, cache_dir=None) -> pd.DataFrame:
+    """
+    Solve every scenario in a process pool. Coverage matrices are built once per
+    (scheme, radius) in the parent and handed to each worker at start-up. out_csv is
+    rewritten on every call and each finished scenario is appended to it immediately (and
+    its sites written to optimal_camera_sites_{name}.csv), so a long sweep can be watched;
+    to resume an interrupted sweep, rerun it with the same cache_dir.
+    warm_start=True (CBC only) groups the scenarios that share a (scheme, radius) into one
+    task solved with solve_budget_sweep, so larger budgets start from the smaller ones.
+    cache_dir (e.g. result_cache.CACHE_DIR) reuses solutions of scenarios whose weights,
+    candidates, K, radius and solver settings were solved before.
+    Returns all results in scenario order.
+    """
+    inputs = prepare_inputs(grid_df, scenarios, top_n)
+    out_csv = Path(out_csv)
+    sites_dir = Path(sites_dir); sites_dir.mkdir(parents=True, exist_ok=True)
+    max_workers = max_workers or os.cpu_count()
+
+    rows = []
+    with open(out_csv, "w", newline="") as fh, \
+         ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(inputs,)) as pool:
+        writer = csv.DictWriter(fh, fieldnames=RESULT_COLS)
+        writer.writeheader(); fh.flush()
+
+        if warm_start and solver == "cbc":
+            groups = {}
+            for s in scenarios:
+                groups.setdefault((s["scheme"]["name"], float(s["RADIUS"])), []).append(s)
+            futures = [pool.submit(solve_scenario_group, g, time_limit, cache_dir) for g in groups.values()]
+        else:
+            futures = [pool.submit(solve_scenario, s, solver, time_limit, cache_dir) for s in scenarios]
+        for fut in as_completed(futures):
+            res = fut.result()
+            for row, sites in (res if isinstance(res, list) else [res]):
+                sites.to_csv(sites_dir / f"optimal_camera_sites_{row['scenario']}.csv", index=False)
+                writer.writerow(row); fh.flush()
+                rows.append(row)
+                print(f"[{row['scenario']}] {row['status']}: {row['coverage_risk_percent']:.2f}% risk "
+                      f"covered ({row['seconds']:.1f}s)")
+
+    order = {s["name"]: k for k, s in enumerate(scenarios)}
+    return pd.DataFrame(rows, columns=RESULT_COLS).sort_values("scenario", key=lambda c: c.map(order)).reset_index(drop=True)
@@ -0,0 +1,66 @@
+# models/optimization/weights.py
+import numpy as np
+import pandas as pd
+
+# the "NEW WEIGHT DEFINITION WITH WEATHER (+ model risk)" cell of the optimization notebooks
+DEFAULT_SCHEME = {
+    "name": "base",
+    "downtown_premium": 0.2,  # 20% extra weight for downtown cells
+    "weather_coef": 0.5,      # weight on min-max normalized mean_precip + mean_snow
+    "model_coef": 0.5,        # weight on min-max normalized NB lambda
+    "severity": False,        # True: severity-weighted collisions instead of collision_count
+}
+SEVERITY_COL = "severity_weight"  # per-cell sum of collision severity (demand_points.SEVERITY_WEIGHTS)
+
+#utils -
+def safe_min_max(series: pd.Series) -> pd.Series:
+    s_min, s_max = series.min(), series.max()
+    if s_max > s_min:
+        return (series - s_min) / (s_max - s_min)
+    return 0 * series  # all zeros if no variation
+
+def risk_weights(grid_df: pd.DataFrame, scheme: dict = None) -> np.ndarray:
+    """
+    w_i = collision_count * (1 + weather_coef * (precip_norm + snow_norm) + model_coef * lambda_norm)
+          * (1 + downtown_premium * downtown), clipped at 0.
+    Missing scheme keys fall back to DEFAULT_SCHEME.
+    """
+    return weight_matrix(grid_df, [scheme or {}])[:, 0]
+
+def weight_matrix(grid_df: pd.DataFrame, schemes, severity=None) -> np.ndarray:
+    """
+    risk_weights for many schemes in one pass: the min-max terms are computed once and every
+    coefficient becomes a vector over schemes, so the result is the (n_cells x n_schemes)
+    broadcast of the same formula. Schemes with "severity": True use the per-cell severity
+    weight (the severity array, else grid_df[SEVERITY_COL]) as the base instead of collision_count.
+    """
+    S = [{**DEFAULT_SCHEME, **(s or {})} for s in schemes]
+    coef = lambda k: np.array([s[k] for s in S], dtype=float)[None, :]
+
+    base = np.repeat(grid_df["collision_count"].to_numpy(dtype=float)[:, None], len(S), axis=1)
+    use_sev = np.array([bool(s["severity"]) for s in S])
+    if use_sev.any():
+        if severity is None:
+            if SEVERITY_COL not in grid_df.columns:
+                raise ValueError(f"severity-weighted scheme needs a severity array or a '{SEVERITY_COL}' column")
+            severity = grid_df[SEVERITY_COL]
+        base[:, use_sev] = np.asarray(severity, dtype=float)[:, None]
+
+    weather = (safe_min_max(grid_df["mean_precip"].astype(float)) +
+               safe_min_max(grid_df["mean_snow"].astype(float))).to_numpy()[:, None]
+    lam = safe_min_max(grid_df["lambda"].astype(float)).to_numpy()[:, None]
+    downtown = grid_df["downtown"].to_numpy(dtype=float)[:, None]
+
+    W = base * (1 + coef("weather_coef") * weather + coef("model_coef") * lam) \
+        * (1 + coef("downtown_premium") * downtown)
+    return np.clip(W, 0, None)
+
+def scheme_names(schemes) -> list:
+    return [s.get("name", f"scheme_{k}") for k, s in enumerate(schemes)]
+
+def random_schemes(n: int, seed: int = 0, weather=(0.0, 1.0), model=(0.0, 1.0), downtown=(0.0, 0.5),
+                   severity: bool = False) -> list:
+    """n schemes with coefficients drawn uniformly from the given ranges (for robustness sweeps)."""
+    rng = np.random.default_rng(seed)
+    return [{"name": f"rand_{k}", "weather_coef": rng.uniform(*weather), "model_coef": rng.uniform(*model),
+             "downtown_premium": rng.uniform(*downtown), "severity": severity} for k in range(n)]